@@ -0,0 +1,73 @@
+# Run from the python directory with: python -m benchmarks.bench_import
+#
+# Measures the time taken by each statement in a fresh interpreter, and fails if any of the modules
+# which the statement should leave out were imported, which unlike durations does not depend on the
+# machine. Modules are read from sys.modules as 'python -X importtime' does not report those
+# imported through importlib.import_module(), such as the lazily imported submodules of the package.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from .common import format_duration
+
+
+# Statements and the modules which they should not import
+SCENARIOS = [
+  ("import quantops", ["decimal", "quantops.core", "quantops.parser", "snaptext"]),
+  ("from quantops import UnitRegistry", ["quantops.loader", "snaptext", "tomllib"]),
+  ("from quantops import UnitRegistry; UnitRegistry.get_default()", ["numpy"])
+]
+
+PROGRAM = """
+import json, sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+json.dump({ 'duration': time.perf_counter() - start, 'modules': list(sys.modules) }, sys.stdout)
+"""
+
+
+def run_statement(statement: str, /) -> tuple[float, list[str]]:
+  env = {
+    **os.environ,
+    'PYTHONPATH': os.pathsep.join([os.getcwd(), *filter(None, [os.environ.get('PYTHONPATH')])])
+  }
+
+  process = subprocess.run([sys.executable, "-c", PROGRAM, statement], capture_output=True, check=True, env=env, text=True)
+  output = json.loads(process.stdout)
+
+  return output['duration'], output['modules']
+
+def measure_import(statement: str, /, *, repeat: int):
+  durations = list[float]()
+  modules = list[str]()
+
+  for _ in range(repeat):
+    duration, modules = run_statement(statement)
+    durations.append(duration)
+
+  return statistics.median(durations), modules
+
+
+def main():
+  parser = argparse.ArgumentParser()
+  parser.add_argument('--repeat', type=int, default=15)
+  args = parser.parse_args()
+
+  failed = False
+
+  for statement, excluded_modules in SCENARIOS:
+    duration, modules = measure_import(statement, repeat=args.repeat)
+    unexpected_modules = [name for name in excluded_modules if name in modules]
+    failed |= bool(unexpected_modules)
+
+    print(f"{statement:<65} {format_duration(duration):>10}{'  IMPORTED ' + ', '.join(unexpected_modules) if unexpected_modules else ''}")
+
+  sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+  main()
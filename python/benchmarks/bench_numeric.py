@@ -0,0 +1,27 @@
+# Run from the python directory with: python -m benchmarks.bench_numeric
+
+from quantops import UnitRegistry
+
+from .common import measure, report
+
+
+def main():
+  for numeric in ('decimal', 'float', 'fraction'):
+    registry = UnitRegistry.load_default(numeric=numeric)
+
+    distance = 3.7 * registry.km
+    duration = 12.5 * registry.min
+    resolution = 0.01 * registry.m
+
+    def arithmetic():
+      speed = distance / duration
+      return (speed * duration + distance) * 2.0
+
+    report(f"{numeric}: arithmetic", measure(arithmetic))
+    report(f"{numeric}: power", measure(lambda: distance ** 2))
+    report(f"{numeric}: format", measure(lambda: distance.format('length', resolution=resolution)))
+    report(f"{numeric}: parse", measure(lambda: registry.parse_quantity("3.7 km")))
+
+
+if __name__ == "__main__":
+  main()
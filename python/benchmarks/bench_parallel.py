@@ -0,0 +1,56 @@
+# Run from the python directory with: python -m benchmarks.bench_parallel
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from quantops import UnitRegistry
+from quantops.array import QuantityArray
+from quantops.parallel import ParallelRunner
+
+
+def main():
+  parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_parallel")
+  parser.add_argument('--count', type=int, default=2_000_000, help="number of values")
+  parser.add_argument('--workers', type=int, nargs='*', help="worker counts, defaults to powers of two up to the CPU count")
+  args = parser.parse_args()
+
+  registry = UnitRegistry.get_default()
+  dimensionality = registry.m.dimensionality
+  magnitudes = np.random.default_rng(0).uniform(1e-6, 1e3, args.count)
+
+  cpu_count = os.cpu_count() or 1
+  worker_counts = args.workers or sorted({ 2 ** power for power in range(cpu_count.bit_length()) } | { cpu_count })
+
+  print(f"{args.count} values, {cpu_count} CPUs")
+
+  def run(name: str, fn):
+    start = time.perf_counter()
+    fn()
+    return name, args.count / (time.perf_counter() - start)
+
+  # Single process reference without pools nor shared memory
+  baselines = dict([
+    run("convert", lambda: QuantityArray(dimensionality, registry, magnitudes).to('mm')),
+    run("format", lambda: registry.format_many(QuantityArray(dimensionality, registry, magnitudes), 'length'))
+  ])
+
+  for name, throughput in baselines.items():
+    print(f"{name + ' (serial)':<24} {throughput:>14,.0f} values/s")
+
+  for worker_count in worker_counts:
+    with ParallelRunner(registry, max_workers=worker_count) as runner:
+      # Warms up the pool so that worker startup is not measured
+      runner.convert(magnitudes[:worker_count], dimensionality, 'mm')
+
+      for name, throughput in (
+        run("convert", lambda: runner.convert(magnitudes, dimensionality, 'mm')),
+        run("format", lambda: runner.format_many(magnitudes, dimensionality, 'length'))
+      ):
+        print(f"{f'{name} ({worker_count} workers)':<24} {throughput:>14,.0f} values/s  {throughput / baselines[name]:.2f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,31 @@
+# Run from the python directory with: python -m benchmarks.bench_tokenize
+
+from snaptext import LocatedString
+
+from quantops import UnitRegistry
+from quantops.parser import tokenize
+
+from .common import measure, report
+
+
+def main():
+  registry = UnitRegistry.load_default()
+
+  # Long compound expressions, whose cost per token should not depend on their length
+  for count in (10, 100, 1000):
+    text = LocatedString(" * ".join(["(kg * m^2) / (s^2 * mol)"] * count))
+    token_count = len(tokenize(text, registry).tokens)
+    report(f"tokenize compound x{count}", measure(lambda: tokenize(text, registry)), count=token_count)
+
+  # Many short strings, as found in tabular data
+  texts = [LocatedString(f"{index}.5 mg/ml") for index in range(1000)]
+
+  def tokenize_all():
+    for text in texts:
+      tokenize(text, registry)
+
+  report("tokenize short x1000", measure(tokenize_all), count=len(texts))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,35 @@
+import timeit
+from typing import Callable
+
+
+def measure_times(fn: Callable[[], object], /, *, repeat: int = 5):
+  timer = timeit.Timer(fn)
+  number, _ = timer.autorange()
+
+  return [duration / number for duration in timer.repeat(repeat=repeat, number=number)], number
+
+def measure(fn: Callable[[], object], /, *, repeat: int = 5):
+  return min(measure_times(fn, repeat=repeat)[0])
+
+def format_duration(seconds: float, /):
+  for unit, factor in (('s', 1.0), ('ms', 1e-3), ('µs', 1e-6)):
+    if seconds >= factor:
+      return f"{seconds / factor:.2f} {unit}"
+
+  return f"{seconds / 1e-9:.2f} ns"
+
+def report(name: str, seconds: float, /, *, count: int = 1):
+  line = f"{name:<40} {format_duration(seconds):>12}"
+
+  if count > 1:
+    line += f"  ({format_duration(seconds / count)} per item)"
+
+  print(line)
+
+
+__all__ = [
+  'format_duration',
+  'measure',
+  'measure_times',
+  'report'
+]
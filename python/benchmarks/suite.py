@@ -0,0 +1,169 @@
+# Run from the python directory with:
+#
+#   python -m benchmarks.suite run [-k PATTERN] [-o results.json]
+#   python -m benchmarks.suite compare base.json head.json [--threshold 1.1]
+#
+# Comparing the results of two checkouts reports cases which became slower than the threshold
+# ratio, and exits with a non-zero status if any did.
+
+import argparse
+import fnmatch
+import json
+import os
+import pickle
+import platform
+import statistics
+import sys
+import tempfile
+from typing import Callable
+
+from quantops import Quantity, UnitRegistry
+
+from .common import format_duration, measure_times
+
+
+Case = Callable[[], object]
+
+SHORT_UNIT = "mg/ml"
+LONG_UNIT = " * ".join(["(kg * m^2) / (s^2 * mol)"] * 20)
+SHORT_QUANTITY = "3.5 mg/ml"
+LONG_QUANTITY = "3.5 " + LONG_UNIT
+
+
+def collect_cases():
+  registry = UnitRegistry.load_default()
+
+  # Caches disabled, for the cost of parsing itself
+  uncached_registry = UnitRegistry.load_default()
+  uncached_registry.resize_caches(0)
+
+  cases = dict[str, Case]()
+
+  cases['load_default'] = lambda: UnitRegistry.load_default(cache=False)
+
+  # Snapshots are opt-in, a temporary cache directory is used unless one is configured
+  if not os.environ.get('QUANTOPS_CACHE_DIR'):
+    os.environ['QUANTOPS_CACHE_DIR'] = tempfile.mkdtemp(prefix="quantops-")
+
+  cases['load_default[snapshot]'] = lambda: UnitRegistry.load_default()
+
+  for name, text in (('short', SHORT_UNIT), ('long', LONG_UNIT)):
+    cases[f'parse_unit[{name}]'] = lambda text=text: uncached_registry.parse_unit(text)
+    cases[f'parse_unit[{name},cached]'] = lambda text=text: registry.parse_unit(text)
+
+  for name, text in (('short', SHORT_QUANTITY), ('long', LONG_QUANTITY)):
+    cases[f'parse_quantity[{name}]'] = lambda text=text: uncached_registry.parse_quantity(text)
+    cases[f'parse_quantity[{name},cached]'] = lambda text=text: registry.parse_quantity(text)
+
+  distance = 3.7 * registry.km
+  duration = 12.5 * registry.min
+
+  def arithmetic():
+    speed = distance / duration
+    return ((speed * duration + distance) * 2) ** 2 / distance
+
+  cases['arithmetic'] = arithmetic
+
+  for context_name, context in registry._contexts.items():
+    quantity = Quantity(context.dimensionality, registry, context.variants[0].options[0].value * 3)
+
+    cases[f'format[{context_name}]'] = lambda quantity=quantity, context_name=context_name: quantity.format(context_name)
+
+  for numeric_registry in (registry, UnitRegistry.load_default(numeric='float')):
+    quantity = 3.7 * numeric_registry.km
+    resolution = 0.01 * numeric_registry.m
+
+    cases[f'format[length,resolution,{numeric_registry._numeric.name}]'] = lambda quantity=quantity, resolution=resolution: quantity.format('length', resolution=resolution)
+
+  cases['serialize'] = registry.serialize
+
+  quantities = [registry.parse_quantity(f"{index} mg/ml") for index in range(100)]
+  pickled_quantities = pickle.dumps(quantities)
+
+  cases['pickle[dumps]'] = lambda: pickle.dumps(quantities)
+  cases['pickle[loads]'] = lambda: pickle.loads(pickled_quantities)
+
+  return cases
+
+
+def run(args: argparse.Namespace):
+  results = dict[str, dict[str, float | int]]()
+
+  for name, case in collect_cases().items():
+    if args.k and not fnmatch.fnmatch(name, args.k):
+      continue
+
+    times, number = measure_times(case, repeat=args.repeat)
+    results[name] = {
+      'min': min(times),
+      'median': statistics.median(times),
+      'number': number,
+      'repeat': len(times)
+    }
+
+    print(f"{name:<50} {format_duration(min(times)):>12}", file=sys.stderr)
+
+  output = {
+    'machine': platform.machine(),
+    'python': platform.python_version(),
+    'results': results
+  }
+
+  if args.output:
+    with open(args.output, "w") as file:
+      json.dump(output, file, indent=2)
+  else:
+    json.dump(output, sys.stdout, indent=2)
+
+def compare(args: argparse.Namespace):
+  with open(args.base) as file:
+    base_results = json.load(file)['results']
+
+  with open(args.head) as file:
+    head_results = json.load(file)['results']
+
+  regressed = False
+
+  for name in sorted(base_results.keys() & head_results.keys()):
+    base_time = base_results[name]['min']
+    head_time = head_results[name]['min']
+    ratio = head_time / base_time
+
+    if ratio > args.threshold:
+      status = "SLOWER"
+      regressed = True
+    elif ratio < (1.0 / args.threshold):
+      status = "faster"
+    else:
+      status = str()
+
+    print(f"{name:<50} {format_duration(base_time):>12} {format_duration(head_time):>12} {ratio:>7.2f}x  {status}")
+
+  for name in sorted(base_results.keys() ^ head_results.keys()):
+    print(f"{name:<50} only in {'base' if name in base_results else 'head'}")
+
+  sys.exit(1 if regressed else 0)
+
+
+def main():
+  parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+  subparsers = parser.add_subparsers(dest='command', required=True)
+
+  run_parser = subparsers.add_parser('run')
+  run_parser.add_argument('-k', help="only run cases whose name matches this glob pattern")
+  run_parser.add_argument('-o', '--output', help="file to write results to, defaults to stdout")
+  run_parser.add_argument('--repeat', type=int, default=5)
+  run_parser.set_defaults(fn=run)
+
+  compare_parser = subparsers.add_parser('compare')
+  compare_parser.add_argument('base')
+  compare_parser.add_argument('head')
+  compare_parser.add_argument('--threshold', type=float, default=1.1, help="ratio above which a case is reported as slower")
+  compare_parser.set_defaults(fn=compare)
+
+  args = parser.parse_args()
+  args.fn(args)
+
+
+if __name__ == "__main__":
+  main()
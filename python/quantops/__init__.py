@@ -1,2 +1,59 @@
-from .core import *
-from .parser import *
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from .core import (AtomicUnit, Context, Converter, DimensionName,
+                     Dimensionality, InvalidUnitNameError, PrefixSystemName,
+                     Quantity, QuantityContext, RowError, SystemName, Unit,
+                     UnitRegistry)
+  from .parser import ParserError
+
+
+# Submodules are only imported once one of their names is first accessed, keeping the import of
+# the package itself cheap
+EXPORTS = {
+  'AtomicUnit': 'core',
+  'Context': 'core',
+  'Converter': 'core',
+  'Dimensionality': 'core',
+  'DimensionName': 'core',
+  'InvalidUnitNameError': 'core',
+  'PrefixSystemName': 'core',
+  'Quantity': 'core',
+  'QuantityContext': 'core',
+  'RowError': 'core',
+  'SystemName': 'core',
+  'Unit': 'core',
+  'UnitRegistry': 'core',
+  'ParserError': 'parser'
+}
+
+def __getattr__(name: str):
+  if not name in EXPORTS:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+  value = getattr(importlib.import_module(f".{EXPORTS[name]}", __name__), name)
+  globals()[name] = value
+
+  return value
+
+def __dir__():
+  return [*globals(), *EXPORTS]
+
+
+__all__ = [
+  'AtomicUnit',
+  'Context',
+  'Converter',
+  'Dimensionality',
+  'DimensionName',
+  'InvalidUnitNameError',
+  'ParserError',
+  'PrefixSystemName',
+  'Quantity',
+  'QuantityContext',
+  'RowError',
+  'SystemName',
+  'Unit',
+  'UnitRegistry'
+]
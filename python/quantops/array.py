@@ -0,0 +1,424 @@
+import bisect
+import itertools
+import math
+import operator
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Iterable, Literal, Optional, Sequence, cast
+
+import numpy as np
+
+from .core import (FLOAT_DECIMAL_COUNT_LIMIT, FLOAT_EPSILON, FLOAT_EXACT_LIMIT,
+                   AtomicUnit, Context, Dimensionality, Quantity, RowError,
+                   SystemName, Unit, UnitRegistry, format_assembly)
+from .numeric import SCALAR_TYPES, Number
+from .util import is_array
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class QuantityArray:
+  dimensionality: Dimensionality
+  registry: UnitRegistry = field(repr=False)
+  value: np.ndarray
+
+  __array_ufunc__ = None
+
+  @classmethod
+  def _from_scale(cls, dimensionality: Dimensionality, registry: UnitRegistry, value: Any, factor: float):
+    return cls(dimensionality, registry, np.asarray(value, dtype=np.float64) * factor)
+
+  @classmethod
+  def _from_unit(cls, unit: Unit, value: Any, /):
+    # As with scalars, multiplying by a unit only scales magnitudes, offsets being accounted for by
+    # magnitude_as(), to() and formatting
+    return cls._from_scale(unit.dimensionality, unit.registry, value, float(unit.value))
+
+  def _check_other_dimensionality(self, other: 'Quantity | QuantityArray', /):
+    if self.dimensionality != other.dimensionality:
+      raise ValueError("Operation with different dimensionalities")
+
+  def _check_other_registry(self, other: 'Quantity | QuantityArray | Unit', /):
+    if self.registry is other.registry:
+      return self.registry
+
+    return self.registry._merge(other.registry)
+
+  def _other_registry(self, other: Any, /):
+    return self._check_other_registry(other) if isinstance(other, (Quantity, QuantityArray)) else self.registry
+
+  def _other_magnitude(self, other: Any, /) -> Optional[np.ndarray | float]:
+    if isinstance(other, (Quantity, QuantityArray)):
+      self._check_other_dimensionality(other)
+      self._check_other_registry(other)
+
+      return other.value if isinstance(other, QuantityArray) else float(other.value)
+
+    if isinstance(other, SCALAR_TYPES) or is_array(other):
+      if self.dimensionality:
+        raise ValueError("Operation with different dimensionalities")
+
+      return np.asarray(other, dtype=np.float64) if is_array(other) else float(other)
+
+    return None
+
+  def _with_value(self, value: np.ndarray, dimensionality: Optional[Dimensionality] = None, registry: Optional[UnitRegistry] = None, /):
+    return self.__class__(
+      dimensionality=(dimensionality if dimensionality is not None else self.dimensionality),
+      registry=(registry if registry is not None else self.registry),
+      value=value
+    )
+
+  @property
+  def dimensionless(self):
+    return not self.dimensionality
+
+  @property
+  def magnitude(self):
+    return self.value
+
+  @property
+  def shape(self):
+    return self.value.shape
+
+  def magnitude_as(self, unit: AtomicUnit):
+    if self.dimensionality != unit.dimensionality:
+      raise ValueError("Operation with different dimensionalities")
+
+    self._check_other_registry(unit)
+    return (self.value - float(unit.offset)) / float(unit.value)
+
+  def to(self, unit: Unit | str, /) -> np.ndarray:
+    converter = self.registry._base_converter(unit)
+
+    if self.dimensionality is not converter.dimensionality:
+      raise ValueError("Operation with different dimensionalities")
+
+    return self.value * converter.scale_float + converter.offset_float
+
+  def __len__(self):
+    return len(self.value)
+
+  def __getitem__(self, key: Any, /):
+    value = self.value[key]
+
+    if np.ndim(value) == 0:
+      return Quantity(
+        dimensionality=self.dimensionality,
+        registry=self.registry,
+        value=self.registry._numeric.convert(float(value))
+      )
+
+    return self._with_value(value)
+
+  def __iter__(self):
+    for index in range(len(self)):
+      yield self[index]
+
+
+  def __eq__(self, other: Any, /): # type: ignore
+    if not isinstance(other, (Quantity, QuantityArray)):
+      return NotImplemented
+
+    if (other.registry is not self.registry) or (other.dimensionality != self.dimensionality):
+      return np.zeros(self.value.shape, dtype=bool)
+
+    return self.value == (other.value if isinstance(other, QuantityArray) else float(other.value))
+
+  def __ne__(self, other: Any, /): # type: ignore
+    result = self.__eq__(other)
+    return result if result is NotImplemented else np.logical_not(result)
+
+  def __lt__(self, other: 'Quantity | QuantityArray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self.value < other_value
+
+  def __le__(self, other: 'Quantity | QuantityArray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self.value <= other_value
+
+  def __gt__(self, other: 'Quantity | QuantityArray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self.value > other_value
+
+  def __ge__(self, other: 'Quantity | QuantityArray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self.value >= other_value
+
+
+  def __add__(self, other: 'Quantity | QuantityArray | float | np.ndarray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self._with_value(self.value + other_value, None, self._other_registry(other))
+
+  def __radd__(self, other: 'Quantity | float | np.ndarray', /):
+    return self.__add__(other)
+
+  def __sub__(self, other: 'Quantity | QuantityArray | float | np.ndarray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self._with_value(self.value - other_value, None, self._other_registry(other))
+
+  def __rsub__(self, other: 'Quantity | float | np.ndarray', /):
+    if (other_value := self._other_magnitude(other)) is None:
+      return NotImplemented
+
+    return self._with_value(other_value - self.value, None, self._other_registry(other))
+
+  def __neg__(self):
+    return self._with_value(-self.value)
+
+  def __pos__(self):
+    return self
+
+  def __abs__(self):
+    return self._with_value(np.abs(self.value))
+
+  def __mul__(self, other: 'Decimal | Quantity | QuantityArray | Unit | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES):
+      return self._with_value(self.value * float(other))
+
+    if is_array(other):
+      return self._with_value(self.value * other)
+
+    if not isinstance(other, (Quantity, QuantityArray, Unit)):
+      return NotImplemented
+
+    registry = self._check_other_registry(other)
+
+    return self._with_value(
+      self.value * (other.value if isinstance(other, QuantityArray) else float(other.value)),
+      self.dimensionality * other.dimensionality,
+      registry
+    )
+
+  def __rmul__(self, other: 'Decimal | Quantity | Unit | float | np.ndarray', /):
+    return self.__mul__(other)
+
+  def __truediv__(self, other: 'Decimal | Quantity | QuantityArray | Unit | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES):
+      return self._with_value(self.value / float(other))
+
+    if is_array(other):
+      return self._with_value(self.value / other)
+
+    if not isinstance(other, (Quantity, QuantityArray, Unit)):
+      return NotImplemented
+
+    registry = self._check_other_registry(other)
+
+    return self._with_value(
+      self.value / (other.value if isinstance(other, QuantityArray) else float(other.value)),
+      self.dimensionality / other.dimensionality,
+      registry
+    )
+
+  def __rtruediv__(self, other: 'Decimal | Quantity | Unit | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES) or is_array(other):
+      return self._with_value(np.asarray(other, dtype=np.float64) / self.value, self.dimensionality ** Decimal(-1))
+
+    if not isinstance(other, (Quantity, Unit)):
+      return NotImplemented
+
+    registry = self._check_other_registry(other)
+    return self._with_value(float(other.value) / self.value, other.dimensionality / self.dimensionality, registry)
+
+  def __pow__(self, other: Decimal | float, /):
+    return self._with_value(self.value ** float(other), self.dimensionality ** Decimal(other))
+
+  def __repr__(self):
+    assembly = format_assembly(self.registry._base_option(self.dimensionality).assembly, style='symbol')
+    return f"{self.__class__.__name__}({self.value!r}, {assembly!r})"
+
+
+def format_many(
+    registry: UnitRegistry,
+    values: 'Sequence[Quantity] | QuantityArray | np.ndarray | Sequence[float]',
+    context: Context,
+    *,
+    resolution: Optional[Quantity],
+    style: Literal['label', 'symbol'],
+    system: SystemName
+  ):
+  if resolution and (resolution.dimensionality != context.dimensionality):
+    raise ValueError("Dimensionality mismatch")
+
+  exact_values: Optional[list[Number]] = None
+
+  if isinstance(values, QuantityArray):
+    if not registry._derives_from(values.registry):
+      raise ValueError("Operation with different registries")
+
+    if values.dimensionality != context.dimensionality:
+      raise ValueError("Dimensionality mismatch")
+
+    magnitudes = np.ravel(values.value).astype(np.float64, copy=False)
+  elif (not is_array(values)) and (len(values) > 0) and isinstance(values[0], Quantity):
+    quantities = cast(Sequence[Quantity], values)
+
+    # Dimensionalities are interned and can be compared by identity
+    if set(map(id, map(operator.attrgetter('dimensionality'), quantities))) != {id(context.dimensionality)}:
+      raise ValueError("Dimensionality mismatch")
+
+    if not all(map(registry._derives_from, set(map(operator.attrgetter('registry'), quantities)))):
+      raise ValueError("Operation with different registries")
+
+    exact_values = list(map(operator.attrgetter('value'), quantities))
+    magnitudes = np.fromiter(map(float, exact_values), dtype=np.float64, count=len(exact_values))
+  else:
+    magnitudes = np.ravel(np.asarray(values, dtype=np.float64))
+
+  def exact_value(index: int, /):
+    return exact_values[index] if exact_values is not None else registry._numeric.convert(float(magnitudes[index]))
+
+  plan = context._format_plan(system, style)
+  resolution_value = resolution.value if resolution else 0.0
+  output = [str()] * len(magnitudes)
+
+
+  # Select options
+
+  option_values = np.array(plan.values, dtype=np.float64)
+  run_starts = np.array(plan.run_starts, dtype=np.intp)
+
+  with np.errstate(invalid='ignore'):
+    finite = np.isfinite(magnitudes)
+    positions = np.searchsorted(option_values, magnitudes, side='left')
+    selected = np.where(positions > 0, run_starts[np.maximum(positions - 1, 0)], 0)
+    selected[magnitudes < 0] = run_starts[-1]
+    selected[(magnitudes == 0) | ~finite] = bisect.bisect_left(plan.values, plan.first.value)
+
+    # Magnitudes equal to an option value after rounding to float64 are selected exactly, as are
+    # quantities whose value cannot be represented by a finite, non-zero float64.
+    ambiguous = np.isin(magnitudes, option_values)
+
+    if exact_values is not None:
+      ambiguous |= ~finite | (magnitudes == 0)
+
+  for index in np.flatnonzero(ambiguous).tolist():
+    value = exact_value(index)
+    plan_option = plan.pick(value) if math.isfinite(value) else plan.first
+    output[index] = plan_option.format(value, resolution_value)
+
+
+  # Format magnitudes by option
+
+  remaining = ~ambiguous
+
+  for option_index in np.unique(selected[remaining]).tolist():
+    plan_option = plan.options[option_index]
+    group = np.flatnonzero(remaining & (selected == option_index))
+    decimal_count = plan_option.decimal_count(resolution_value)
+
+    # Scientific notation depends on the exact digits of the value and is always formatted in Decimal
+    if (decimal_count is None) or (decimal_count > FLOAT_DECIMAL_COUNT_LIMIT):
+      for index in group.tolist():
+        output[index] = plan_option.format(exact_value(index), resolution_value)
+
+      continue
+
+    group_magnitudes = magnitudes[group]
+    offset = float(plan_option.offset) if (plan_option.offset is not None) else 0.0
+
+    with np.errstate(invalid='ignore', over='ignore'):
+      shifted = group_magnitudes - offset
+      absolute = np.abs(shifted) / plan_option.value_float
+      scaled = absolute * (10.0 ** decimal_count)
+
+      # The float64 result matches the Decimal one as long as the error on the shifted and scaled magnitudes
+      # cannot move them across zero or across a rounding boundary.
+      if (exact_values is not None) or (plan_option.offset is not None):
+        shifted_error = (np.abs(group_magnitudes) + abs(offset)) * (4 * FLOAT_EPSILON)
+      else:
+        shifted_error = np.zeros_like(shifted)
+
+      scaled_error = shifted_error * ((10.0 ** decimal_count) / plan_option.value_float) + scaled * (4 * FLOAT_EPSILON)
+      safe = (
+        (scaled < FLOAT_EXACT_LIMIT)
+        & (np.abs((scaled - np.floor(scaled)) - 0.5) > scaled_error)
+        & ((np.abs(shifted) > shifted_error) | (shifted_error == 0))
+      )
+
+    spec = f".{decimal_count}f"
+    suffix = plan_option.suffix
+
+    for index, magnitude, negative in zip(group[safe].tolist(), absolute[safe].tolist(), (shifted[safe] < 0).tolist()):
+      output[index] = (('-' + format(magnitude, spec)) if negative else format(magnitude, spec)) + suffix
+
+    for index in group[~safe].tolist():
+      output[index] = plan_option.format(exact_value(index), resolution_value)
+
+  return output
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnChunk:
+  codes: np.ndarray
+  dimensionalities: list[Dimensionality]
+  errors: list[RowError]
+  magnitudes: np.ndarray
+  registry: UnitRegistry
+  start: int
+
+  def array(self):
+    # Rows which failed to parse are left as NaN
+    if len(self.dimensionalities) > 1:
+      raise ValueError("Column with different dimensionalities")
+
+    if not self.dimensionalities:
+      raise ValueError("Column without valid values")
+
+    return QuantityArray(self.dimensionalities[0], self.registry, self.magnitudes)
+
+  def __len__(self):
+    return len(self.magnitudes)
+
+
+def parse_column(registry: UnitRegistry, values: Iterable[str], /, *, chunk_size: int = 65536):
+  # Rows are grouped by unit so that magnitudes are converted with one array operation per unit
+  errors = list[RowError]()
+  parts_iterator = registry._iter_parse_quantity_parts(values, errors)
+
+  for start in itertools.count(0, chunk_size):
+    chunk = list(itertools.islice(parts_iterator, chunk_size))
+
+    if not chunk:
+      break
+
+    codes = np.full(len(chunk), -1, dtype=np.int32)
+    magnitudes = np.full(len(chunk), np.nan)
+
+    dimensionality_codes = dict[Dimensionality, int]()
+    groups = dict[Optional[Unit], tuple[list[int], list[float | int]]]()
+
+    for index, parts in enumerate(chunk):
+      if parts is not None:
+        scalar, unit = parts
+        group = groups.setdefault(unit, (list(), list()))
+        group[0].append(index)
+        group[1].append(scalar)
+
+    for unit, (indices, scalars) in groups.items():
+      dimensionality = unit.dimensionality if (unit is not None) else Dimensionality()
+
+      codes[indices] = dimensionality_codes.setdefault(dimensionality, len(dimensionality_codes))
+      magnitudes[indices] = QuantityArray._from_unit(unit, scalars).value if (unit is not None) else scalars
+
+    yield ColumnChunk(codes, list(dimensionality_codes), errors.copy(), magnitudes, registry, start)
+    errors.clear()
+
+
+__all__ = [
+  'ColumnChunk',
+  'QuantityArray',
+  'parse_column'
+]
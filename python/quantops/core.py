@@ -1,16 +1,28 @@
 from decimal import Decimal
+import bisect
 import functools
+import itertools
 import math
 import operator
-import tomllib
-from dataclasses import dataclass, field
-from importlib.resources import files
-from typing import (IO, ClassVar, Generic, Literal, NewType, NotRequired,
-                    Optional, Self, TypedDict, TypeVar, cast, final, overload)
+import os
+import threading
+from collections import ChainMap
+from dataclasses import dataclass, field, replace
+from typing import (IO, TYPE_CHECKING, Any, Callable, ClassVar, Generic,
+                    Iterable, Literal, Mapping, NewType, NoReturn,
+                    NotRequired, Optional, Self, Sequence, TypedDict, TypeVar,
+                    cast, final, overload)
 
-from snaptext import LocatedString
+from .numeric import (SCALAR_TYPES, NumericBackend, NumericBackendName,
+                      Number, convert_decimal, get_numeric_backend, to_decimal)
+from .util import FrozenDict, LRUCache, is_array
 
-from .util import FrozenDict
+if TYPE_CHECKING:
+  import numpy as np
+
+  from .array import QuantityArray
+  from .loader import RegistryChanges, RegistryData
+  from .prefixes import PrefixIndex, PrefixSystem
 
 
 SUPERSCRIPT_CHARS = {
@@ -34,22 +46,101 @@ PrefixSystemName = NewType('PrefixSystemName', str)
 SystemName = NewType('SystemName', str)
 UnitId = NewType('UnitId', str)
 
+CACHE_MISS = object()
+
+# Size beyond which the memoized arithmetic of dimensionalities is discarded, results remaining interned
+DIMENSIONALITY_MEMO_LIMIT = 4096
+
 @final
 class Dimensionality(FrozenDict[DimensionName, Decimal]):
+  __slots__ = ('_hash', '_index')
+
+  _hash: int
+  _index: int
+
+  _indices: ClassVar = itertools.count()
+  _instances: ClassVar[dict[tuple[tuple[DimensionName, Decimal], ...], 'Dimensionality']] = dict()
+  _powers: ClassVar[dict[tuple[int, Decimal], 'Dimensionality']] = dict()
+  _products: ClassVar[dict[tuple[int, int], 'Dimensionality']] = dict()
+  _quotients: ClassVar[dict[tuple[int, int], 'Dimensionality']] = dict()
+
+  def __new__(cls, value: Mapping[DimensionName, Decimal] = FrozenDict(), /):
+    key = tuple(sorted(value.items()))
+
+    if (instance := cls._instances.get(key)) is not None:
+      return instance
+
+    instance = super().__new__(cls)
+    dict.update(instance, key)
+
+    instance._hash = hash(frozenset(key))
+    instance._index = next(cls._indices)
+
+    return cls._instances.setdefault(key, instance)
+
+  def __init__(self, value: Mapping[DimensionName, Decimal] = FrozenDict(), /):
+    pass
+
+  def __eq__(self, other: object, /):
+    if isinstance(other, Dimensionality):
+      return self is other
+
+    return super().__eq__(other)
+
+  def __ne__(self, other: object, /):
+    if isinstance(other, Dimensionality):
+      return self is not other
+
+    return super().__ne__(other)
+
+  def __hash__(self):
+    return self._hash
+
   def __mul__(self, other: 'Dimensionality', /):
-    return self.__class__({
-      dimension: power for dimension
-        in {*self.keys(), *other.keys()}
-        if (power := self.get(dimension, Decimal()) + other.get(dimension, Decimal())) != 0
-    })
+    key = (self._index, other._index)
+
+    if (result := self._products.get(key)) is None:
+      result = self._memoize(self._products, key, self.__class__({
+        dimension: power for dimension
+          in {*self.keys(), *other.keys()}
+          if (power := self.get(dimension, Decimal()) + other.get(dimension, Decimal())) != 0
+      }))
+
+    return result
 
   def __pow__(self, other: Decimal, /):
-    return self.__class__({
-      dimension: new_power for dimension, power in self.items() if (new_power := power * other) != 0
-    })
+    key = (self._index, other)
+
+    if (result := self._powers.get(key)) is None:
+      result = self._memoize(self._powers, key, self.__class__({
+        dimension: new_power for dimension, power in self.items() if (new_power := power * other) != 0
+      }))
+
+    return result
 
   def __truediv__(self, other: Self, /):
-    return self * (other ** Decimal(-1))
+    key = (self._index, other._index)
+
+    if (result := self._quotients.get(key)) is None:
+      result = self._memoize(self._quotients, key, self * (other ** Decimal(-1)))
+
+    return result
+
+  def __reduce__(self):
+    return self.__class__, (dict(self),)
+
+  # Instances are shared through interning and must not be mutated
+  def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"{self.__class__.__name__} is immutable")
+
+  __delitem__ = __ior__ = __setitem__ = clear = pop = popitem = setdefault = update = _readonly # type: ignore
+
+  @classmethod
+  def _memoize(cls, table: dict[Any, 'Dimensionality'], key: Any, result: 'Dimensionality', /):
+    if len(table) >= DIMENSIONALITY_MEMO_LIMIT:
+      table.clear()
+
+    return table.setdefault(key, result)
 
 
 
@@ -76,24 +167,57 @@ def format_assembly(assembly: 'ConstantUnitAssembly', *, style: Literal['label',
 
     return output
 
-def format_quantity(value: Decimal | float, resolution: Decimal | float, option: 'ContextVariantOption', *, style: Literal['label', 'symbol']):
-  decimal_count = max(0, math.ceil(-math.log10(Decimal(resolution) / option.value))) if (resolution > 0) else None
-  output = str()
+def format_assembly_suffix(assembly: 'ConstantUnitAssembly', *, style: Literal['label', 'symbol']):
+  if not assembly:
+    return str()
+
+  assembled = format_assembly(assembly, style=style)
+  return assembled if assembled.startswith("°") else (" " + assembled)
+
+# Bound on the relative error of a float64 operation
+FLOAT_EPSILON = 2.0 ** -52
+
+# Largest scaled magnitude for which all printed digits are significant in float64
+FLOAT_EXACT_LIMIT = 1e15
+
+# Largest decimal count for which the power of ten used for scaling is exact in float64
+FLOAT_DECIMAL_COUNT_LIMIT = 22
+
+FIXED_FORMAT_SPECS = [f".{decimal_count}f" for decimal_count in range(FLOAT_DECIMAL_COUNT_LIMIT + 1)]
+FIXED_FORMAT_SCALES = [10.0 ** decimal_count for decimal_count in range(FLOAT_DECIMAL_COUNT_LIMIT + 1)]
+
+def format_decimal_count(resolution: Number, option_value: Number):
+  return max(0, math.ceil(-math.log10(to_decimal(resolution) / to_decimal(option_value)))) if (resolution > 0) else None
 
-  if value < 0:
-    output += '-'
+def format_scaled_magnitude(value: Number, decimal_count: Optional[int], option_value: Number, option_value_float: float, /):
+  sign = '-' if (value < 0) else str()
 
-  output += format(abs(Decimal(value) / option.value), f".{decimal_count}f" if (decimal_count is not None) else "e")
+  # The float64 result matches the Decimal one as long as the error on the scaled magnitude, which
+  # accumulates over the conversions to float64, the division and the scaling, cannot move it across
+  # a rounding boundary, as in array.format_many(). Decimal values are cheaper to format directly.
+  if (decimal_count is not None) and (decimal_count <= FLOAT_DECIMAL_COUNT_LIMIT) and not isinstance(value, Decimal):
+    absolute = abs(float(value)) / option_value_float
+    scaled = absolute * FIXED_FORMAT_SCALES[decimal_count]
 
-  if option.assembly:
-    assembled = format_assembly(option.assembly, style=style)
+    if (scaled < FLOAT_EXACT_LIMIT) and (abs((scaled - math.floor(scaled)) - 0.5) > scaled * (4 * FLOAT_EPSILON)):
+      return sign + format(absolute, FIXED_FORMAT_SPECS[decimal_count])
 
-    if not assembled.startswith("°"):
-      output += " "
+  return sign + format(abs(to_decimal(value) / to_decimal(option_value)), f".{decimal_count}f" if (decimal_count is not None) else "e")
 
-    output += assembled
+def format_magnitude(value: Number, resolution: Number, option_value: Number):
+  return format_scaled_magnitude(value, format_decimal_count(resolution, option_value), option_value, float(option_value))
 
-  return output
+def format_quantity(value: Number, resolution: Number, option: 'ContextVariantOption', *, style: Literal['label', 'symbol']):
+  return format_magnitude(value, resolution, option.value) + format_assembly_suffix(option.assembly, style=style)
+
+def get_coherent_dimension(dimensionality: Dimensionality, offset: Number, value: Number):
+  if (len(dimensionality) == 1) and (offset == 0) and (value == 1):
+    dimension, power = next(iter(dimensionality.items()))
+
+    if power == 1:
+      return dimension
+
+  return None
 
 @dataclass(frozen=True, slots=True)
 class Extent:
@@ -113,16 +237,21 @@ class Extent:
 @dataclass(frozen=True, slots=True)
 class Quantity:
   dimensionality: Dimensionality
-  registry: 'UnitRegistry' = field(repr=False)
-  value: Decimal
+  # Not hashed as quantities of an overlay and of its ancestors may be equal
+  registry: 'UnitRegistry' = field(hash=False, repr=False)
+  value: Number
+
+  __array_ufunc__ = None
 
   def _check_other_dimensionality(self, other: 'Quantity', /):
     if self.dimensionality != other.dimensionality:
       raise ValueError("Operation with different dimensionalities")
 
   def _check_other_registry(self, other: 'Unit | Quantity', /):
-    if self.registry is not other.registry:
-      raise ValueError("Operation with different registries")
+    if self.registry is other.registry:
+      return self.registry
+
+    return self.registry._merge(other.registry)
 
   @property
   def dimensionless(self):
@@ -133,117 +262,154 @@ class Quantity:
     return self.value
 
   def find_context(self):
-    for context in self.registry._contexts.values():
-      if context.dimensionality == self.dimensionality:
-        return context
+    if not (contexts := self.registry._contexts_by_dimensionality.get(self.dimensionality)):
+      raise RuntimeError("No matching context")
 
-    raise RuntimeError("No matching context")
+    return contexts[0]
 
   def magnitude_as(self, unit: 'AtomicUnit'):
     if self.dimensionality != unit.dimensionality:
       raise ValueError("Operation with different dimensionalities")
 
-    if self.registry is not unit.registry:
-      raise ValueError("Operation with different registries")
-
+    self._check_other_registry(unit)
     return (self.value - unit.offset) / unit.value
 
+  def to(self, unit: 'Unit | str', /):
+    converter = self.registry._base_converter(unit)
+
+    if self.dimensionality is not converter.dimensionality:
+      raise ValueError("Operation with different dimensionalities")
+
+    return self.value * converter.scale + converter.offset
+
   def __eq__(self, other: Self, /): # type: ignore
     if not isinstance(other, self.__class__):
       return NotImplemented
 
-    return (other.registry is self.registry) and ((other.dimensionality, other.value) == (self.dimensionality, self.value))
+    if (other.registry is not self.registry) and not (self.registry._derives_from(other.registry) or other.registry._derives_from(self.registry)):
+      return False
+
+    return (other.dimensionality, other.value) == (self.dimensionality, self.value)
 
   def __lt__(self, other: Self, /):
+    if not isinstance(other, Quantity):
+      return NotImplemented
+
     self._check_other_dimensionality(other)
     self._check_other_registry(other)
 
     return self.value < other.value
 
   def __add__(self, other: 'Quantity | float | int', /):
-    if isinstance(other, (float, int)):
+    if isinstance(other, SCALAR_TYPES):
       return self + self.registry._dimensionless(other)
 
+    if not isinstance(other, Quantity):
+      return NotImplemented
+
     self._check_other_dimensionality(other)
-    self._check_other_registry(other)
+    registry = self._check_other_registry(other)
 
     return self.__class__(
       dimensionality=self.dimensionality,
-      registry=self.registry,
+      registry=registry,
       value=(self.value + other.value)
     )
 
+  @overload
   def __mul__(self, other: 'Decimal | Quantity | Unit | float', /) -> 'Quantity':
-    if isinstance(other, (Decimal, float, int)):
+    ...
+
+  @overload
+  def __mul__(self, other: 'np.ndarray | QuantityArray', /) -> 'QuantityArray':
+    ...
+
+  def __mul__(self, other: 'Decimal | Quantity | QuantityArray | Unit | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES):
       return self * self.registry._dimensionless(other)
 
-    self._check_other_registry(other)
+    if is_array(other):
+      from .array import QuantityArray
+      return QuantityArray._from_scale(self.dimensionality, self.registry, other, float(self.value))
+
+    if not isinstance(other, (Quantity, Unit)):
+      return NotImplemented
+
+    registry = self._check_other_registry(other)
 
     return self.__class__(
       dimensionality=(self.dimensionality * other.dimensionality),
-      registry=self.registry,
-      value=(self.value * Decimal(other.value))
+      registry=registry,
+      value=(self.value * other.value)
     )
 
-  def __rmul__(self, other: Decimal | float):
+  def __rmul__(self, other: 'Decimal | float | np.ndarray'):
     return self.__mul__(other)
 
-  def __truediv__(self, other: 'Unit | Quantity', /) -> 'Quantity':
-    if isinstance(other, (float, int)):
+  @overload
+  def __truediv__(self, other: 'Unit | Quantity | float', /) -> 'Quantity':
+    ...
+
+  @overload
+  def __truediv__(self, other: 'np.ndarray | QuantityArray', /) -> 'QuantityArray':
+    ...
+
+  def __truediv__(self, other: 'Unit | Quantity | QuantityArray | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES):
       return self / self.registry._dimensionless(other)
 
-    self._check_other_registry(other)
+    if is_array(other):
+      from .array import QuantityArray
+      return QuantityArray._from_scale(self.dimensionality, self.registry, 1.0 / other, float(self.value))
+
+    if not isinstance(other, (Quantity, Unit)):
+      return NotImplemented
+
+    registry = self._check_other_registry(other)
 
     return Quantity(
       dimensionality=(self.dimensionality / other.dimensionality),
-      registry=self.registry,
-      value=(self.value / Decimal(other.value))
+      registry=registry,
+      value=(self.value / other.value)
     )
 
-  def __pow__(self, other: Decimal | float, /):
+  def __rtruediv__(self, other: 'Decimal | float | np.ndarray', /):
+    return (self ** -1) * other
+
+  def __pow__(self, other: Number, /):
     return Quantity(
-      dimensionality=(self.dimensionality ** Decimal(other)),
+      dimensionality=(self.dimensionality ** convert_decimal(other)),
       registry=self.registry,
-      value=(self.value ** Decimal(other))
+      value=self.registry._numeric.power(self.value, other)
     )
 
   def format(
       self,
-      context_name: ContextName | str,
+      context_name: Optional[ContextName | str] = None,
       *,
       resolution: Optional[Self] = None,
       style: Literal['label', 'symbol'] = 'symbol',
       system: SystemName = SystemName("SI")
     ):
-    context = self.registry._contexts[ContextName(context_name)]
+    context = self.registry._contexts[ContextName(context_name)] if (context_name is not None) else self.find_context()
 
     if (self.dimensionality != context.dimensionality) or (resolution and (resolution.dimensionality != context.dimensionality)):
       raise ValueError("Dimensionality mismatch")
 
-    variant = next(variant for variant in context.variants if system in variant.systems)
+    plan = context._format_plan(system, style)
+    plan_option = plan.pick(self.value) if math.isfinite(self.value) else plan.first
 
-    def order(option: ContextVariantOption):
-      value = self.value / option.value
-      return (value < 1, value * (1 if value > 1 else -1))
+    return plan_option.format(self.value, resolution.value if resolution else 0.0)
 
-    option = sorted([option for option in variant.options], key=order)[0] if math.isfinite(self.value) else variant.options[0]
-    value = self.value
-
-    if len(option.assembly) == 1:
-      value -= option.assembly[0].unit.offset
+  def serialize(self):
+    from .serialization import serialize_quantity
+    return serialize_quantity(self)
 
-    return format_quantity(value, resolution.value if resolution else 0.0, option, style=style)
+  def __reduce__(self):
+    return self.__class__, (self.dimensionality, self.registry, self.value)
 
   def __repr__(self):
-    assembly = ConstantUnitAssembly()
-
-    for dimension, power in self.dimensionality.items():
-      unit = next(unit for unit in self.registry._units_by_name.values() if (unit.dimensionality == Dimensionality({ dimension: Decimal(1) })) and (unit.offset == 0.0) and (unit.value == 1.0))
-      assembly.append(UnitAssemblyConstantPart(unit, power))
-
-    assembly = sorted(assembly, key=(lambda part: -part.power))
-    quantity = format_quantity(self.value, 0.0, ContextVariantOption(assembly, Decimal(1)), style='symbol')
-
+    quantity = format_quantity(self.value, 0.0, self.registry._base_option(self.dimensionality), style='symbol')
     return f"{self.__class__.__name__}({quantity!r})"
 
 
@@ -251,14 +417,15 @@ class Quantity:
 class Unit:
   dimensionality: Dimensionality
   registry: 'UnitRegistry' = field(repr=False)
-  value: Decimal
+  value: Number
+
+  __array_ufunc__ = None
 
   def find_context(self):
-    for context in self.registry._contexts.values():
-      if context.dimensionality == self.dimensionality:
-        return context
+    if not (contexts := self.registry._contexts_by_dimensionality.get(self.dimensionality)):
+      raise RuntimeError("No matching context")
 
-    raise RuntimeError("No matching context")
+    return contexts[0]
 
   @overload
   def __mul__(self, other: 'Unit', /) -> 'Unit':
@@ -268,17 +435,22 @@ class Unit:
   def __mul__(self, other: Decimal | Quantity | float, /) -> Quantity:
     ...
 
-  def __mul__(self, other: 'Decimal | Quantity | Unit | float', /):
-    if isinstance(other, (Decimal, float, int)):
+  @overload
+  def __mul__(self, other: 'np.ndarray | QuantityArray', /) -> 'QuantityArray':
+    ...
+
+  def __mul__(self, other: 'Decimal | Quantity | QuantityArray | Unit | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES):
       return self * self.registry._dimensionless(other)
 
-    if self.registry is not other.registry:
-      raise ValueError("Operation with different registries")
+    if is_array(other):
+      from .array import QuantityArray
+      return QuantityArray._from_unit(self, other)
 
     if isinstance(other, Unit):
       return Unit(
         dimensionality=(self.dimensionality * other.dimensionality),
-        registry=self.registry,
+        registry=self.registry._merge(other.registry),
         value=(self.value * other.value)
       )
 
@@ -293,7 +465,11 @@ class Unit:
   def __rmul__(self, other: Decimal | Quantity | float, /) -> Quantity:
     ...
 
-  def __rmul__(self, other: 'Decimal | Quantity | Unit | float', /):
+  @overload
+  def __rmul__(self, other: 'np.ndarray | QuantityArray', /) -> 'QuantityArray':
+    ...
+
+  def __rmul__(self, other: 'Decimal | Quantity | QuantityArray | Unit | float | np.ndarray', /):
     return self * other
 
 
@@ -305,30 +481,39 @@ class Unit:
   def __truediv__(self, other: Decimal | Quantity | float, /) -> Quantity:
     ...
 
-  def __truediv__(self, other: 'Decimal | Quantity | Unit | float', /):
-    if isinstance(other, (Decimal, float, int)):
+  @overload
+  def __truediv__(self, other: 'np.ndarray | QuantityArray', /) -> 'QuantityArray':
+    ...
+
+  def __truediv__(self, other: 'Decimal | Quantity | QuantityArray | Unit | float | np.ndarray', /):
+    if isinstance(other, SCALAR_TYPES):
       return self / (other * self.registry.dimensionless)
 
-    if self.registry is not other.registry:
-      raise ValueError("Operation with different registries")
+    if is_array(other):
+      from .array import QuantityArray
+      return QuantityArray._from_scale(self.dimensionality, self.registry, 1.0 / other, float(self.value))
+
+    if not isinstance(other, (Quantity, Unit)):
+      return NotImplemented
 
     if isinstance(other, Unit):
       return Unit(
         dimensionality=(self.dimensionality / other.dimensionality),
-        registry=self.registry,
+        registry=self.registry._merge(other.registry),
         value=(self.value / other.value)
       )
 
     return other / self
 
+  def __rtruediv__(self, other: 'Decimal | float | np.ndarray', /):
+    return (self ** -1) * other
 
-  def __pow__(self, other: Decimal | float, /):
-    other_decimal = Decimal(other)
 
+  def __pow__(self, other: Number, /):
     return Unit(
-      dimensionality=(self.dimensionality ** other_decimal),
+      dimensionality=(self.dimensionality ** convert_decimal(other)),
       registry=self.registry,
-      value=(self.value ** other_decimal)
+      value=self.registry._numeric.power(self.value, other)
     )
 
 
@@ -336,7 +521,7 @@ class Unit:
 class AtomicUnit(Unit):
   dimensionality: Dimensionality
   label: tuple[str, str]
-  offset: Decimal
+  offset: Number
   registry: 'UnitRegistry' = field(repr=False)
   symbol: Optional[tuple[str, str]]
 
@@ -370,40 +555,152 @@ class AtomicUnit(Unit):
 class InvalidUnitNameError(Exception):
   pass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class RowError:
+  error: Exception
+  index: int
+  value: str
+
+
+@dataclass(frozen=True, slots=True)
+class Converter:
+  convert: Callable[[Number], Number] = field(repr=False)
+  dimensionality: Dimensionality
+  offset: Number
+  scale: Number
+  offset_float: float = field(repr=False)
+  scale_float: float = field(repr=False)
+
+  @overload
+  def __call__(self, value: Number, /) -> Number:
+    ...
+
+  @overload
+  def __call__(self, value: 'np.ndarray', /) -> 'np.ndarray':
+    ...
+
+  def __call__(self, value: 'Number | np.ndarray', /):
+    if is_array(value):
+      return cast('np.ndarray', value) * self.scale_float + self.offset_float
+
+    return self.convert(cast(Number, value)) * self.scale + self.offset
+
+@dataclass(frozen=True, slots=True)
 class UnitAssemblyConstantPart:
   unit: AtomicUnit
   power: Decimal
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnitAssemblyVariablePart:
   units: frozenset[AtomicUnit]
   power: Decimal
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnitAssembly:
-  after_variable_parts: list[UnitAssemblyConstantPart]
-  before_variable_parts: list[UnitAssemblyConstantPart]
+  after_variable_parts: tuple[UnitAssemblyConstantPart, ...]
+  before_variable_parts: tuple[UnitAssemblyConstantPart, ...]
   variable_part: Optional[UnitAssemblyVariablePart]
 
-ConstantUnitAssembly = list[UnitAssemblyConstantPart]
+ConstantUnitAssembly = tuple[UnitAssemblyConstantPart, ...]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ContextVariantOption:
   assembly: ConstantUnitAssembly
-  value: Decimal
+  value: Number
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ContextVariant:
-  options: list[ContextVariantOption]
+  options: tuple[ContextVariantOption, ...]
   systems: set[SystemName]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class FormatPlanOption:
+  offset: Optional[Number]
+  option: ContextVariantOption
+  suffix: str
+  value: Number
+  value_float: float
+
+  _decimal_counts: dict[Number, Optional[int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+  def decimal_count(self, resolution: Number, /):
+    if (decimal_count := self._decimal_counts.get(resolution, CACHE_MISS)) is CACHE_MISS:
+      decimal_count = format_decimal_count(resolution, self.value)
+
+      # Bounded in case of resolutions that vary between calls
+      if len(self._decimal_counts) < 64:
+        self._decimal_counts[resolution] = decimal_count
+
+    return cast(Optional[int], decimal_count)
+
+  def format(self, value: Number, resolution: Number, /):
+    if self.offset is not None:
+      value -= self.offset
+
+    return format_scaled_magnitude(value, self.decimal_count(resolution), self.value, self.value_float) + self.suffix
+
+@dataclass(frozen=True, slots=True)
+class FormatPlan:
+  first: FormatPlanOption
+  options: list[FormatPlanOption]
+  run_starts: list[int]
+  values: list[Number]
+
+  @classmethod
+  def compile(cls, variant: ContextVariant, *, style: Literal['label', 'symbol']):
+    plan_options = [FormatPlanOption(
+      offset=(option.assembly[0].unit.offset if len(option.assembly) == 1 else None),
+      option=option,
+      suffix=format_assembly_suffix(option.assembly, style=style),
+      value=option.value,
+      value_float=float(option.value)
+    ) for option in variant.options]
+
+    # Sorting is stable, options with equal values therefore remain in their original order
+    sorted_options = sorted(plan_options, key=(lambda plan_option: plan_option.value))
+    values = [plan_option.value for plan_option in sorted_options]
+
+    return cls(
+      first=plan_options[0],
+      options=sorted_options,
+      run_starts=[bisect.bisect_left(values, value) for value in values],
+      values=values
+    )
+
+  def pick(self, value: Number, /):
+    # Prefer the option with the largest value lower than or equal to the quantity, falling back to the
+    # option with the smallest value. Negative quantities use the option with the largest value.
+
+    if value > 0:
+      index = bisect.bisect_left(self.values, value)
+
+      if (index < len(self.values)) and (self.values[index] == value):
+        return self.options[index]
+
+      return self.options[self.run_starts[index - 1] if index > 0 else 0]
+
+    if value < 0:
+      return self.options[self.run_starts[-1]]
+
+    return self.first
+
+@dataclass(frozen=True, slots=True)
 class Context:
   dimensionality: Dimensionality
   variants: list[ContextVariant]
   name: Optional[ContextName] = None
 
+  _format_plans: dict[tuple[SystemName, str], FormatPlan] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+  def _format_plan(self, system: SystemName, style: Literal['label', 'symbol']):
+    key = (system, style)
+
+    if (plan := self._format_plans.get(key)) is None:
+      variant = next(variant for variant in self.variants if system in variant.systems)
+      plan = self._format_plans.setdefault(key, FormatPlan.compile(variant, style=style))
+
+    return plan
+
   def __repr__(self):
     return f"{self.__class__.__name__}" + (f"({self.name!r})" if self.name else "()")
 
@@ -432,61 +729,351 @@ class Context:
     }
 
 
+# Tables which overlays read from their parent registry while storing their own additions separately
+OVERLAY_TABLES = (
+  '_base_options',
+  '_base_units',
+  '_contexts',
+  '_contexts_by_dimensionality',
+  '_extents_by_dimensionality',
+  '_extents_by_name',
+  '_prefix_systems',
+  '_unit_groups',
+  '_units_by_id',
+  '_units_by_name'
+)
+
 @final
 class UnitRegistry:
-  _default: ClassVar[Optional[Self]] = None
+  CACHE_SIZE: ClassVar[int] = 1024
+
+  _default: ClassVar[Optional['UnitRegistry']] = None
+  _default_lock: ClassVar[threading.RLock] = threading.RLock()
 
+  _caches: dict[str, LRUCache]
+  _base_options: dict[Dimensionality, ContextVariantOption]
+  _base_units: dict[DimensionName, AtomicUnit]
   _contexts: dict[ContextName, Context]
+  _contexts_by_dimensionality: dict[Dimensionality, list[Context]]
   _extents_by_dimensionality: dict[Dimensionality, Extent]
   _extents_by_name: dict[ExtentName, Extent]
+  _fingerprint: Optional[str]
+  _numeric: NumericBackend
+  _parent: Optional[Self]
+  _prefix_index: 'Optional[PrefixIndex]'
+  _prefix_systems: 'dict[PrefixSystemName, PrefixSystem]'
   _unit_groups: dict[str, set[AtomicUnit]]
   _units_by_id: dict[UnitId, AtomicUnit]
   _units_by_name: dict[str, AtomicUnit]
 
-  def __new__(cls, *, _default: bool = False):
+  def __new__(cls, *, _default: bool = False, numeric: NumericBackendName = 'decimal'):
     if _default:
       return cls.get_default()
 
     self = super().__new__(cls)
 
+    self._caches = {
+      'assembly': LRUCache(cls.CACHE_SIZE),
+      'converter': LRUCache(cls.CACHE_SIZE),
+      'quantity_unit': LRUCache(cls.CACHE_SIZE),
+      'unit': LRUCache(cls.CACHE_SIZE)
+    }
+
+    self._base_options = dict()
+    self._base_units = dict()
     self._contexts = dict()
+    self._contexts_by_dimensionality = dict()
     self._extents_by_dimensionality = dict()
     self._extents_by_name = dict()
+    self._fingerprint = None
+    self._numeric = get_numeric_backend(numeric)
+    self._parent = None
+    self._prefix_index = None
+    self._prefix_systems = dict()
     self._unit_groups = dict()
     self._units_by_id = dict()
     self._units_by_name = dict()
 
     return self
 
-  def __init__(self):
+  def __init__(self, *, numeric: NumericBackendName = 'decimal'):
     dimensionless_context_name = ContextName("dimensionless")
     dimensionless_context = Context(
       dimensionality=Dimensionality(),
       name=dimensionless_context_name,
-      variants=[ContextVariant([ContextVariantOption([], Decimal(1))], {SystemName("SI")})]
+      variants=[ContextVariant((ContextVariantOption(tuple(), self._numeric.convert(1)),), {SystemName("SI")})]
     )
 
     dimensionless_unit = AtomicUnit(
       dimensionality=Dimensionality(),
       label=("dimensionless", "dimensionless"),
-      offset=Decimal(),
+      offset=self._numeric.convert(0),
       registry=self,
       symbol=None,
-      value=Decimal(1)
+      value=self._numeric.convert(1)
     )
 
-    self._contexts[dimensionless_context_name] = dimensionless_context
+    self._add_context(dimensionless_context)
     self._units_by_id[dimensionless_unit.id] = dimensionless_unit
     self._units_by_name["dimensionless"] = dimensionless_unit
 
-  def _dimensionless(self, value: Decimal | float, /):
+  def _add_context(self, context: Context, /):
+    assert context.name is not None
+    previous_context = self._contexts.get(context.name)
+    self._contexts[context.name] = context
+
+    if previous_context is not None:
+      # Rebuilt to preserve the order of _contexts, in which a replaced context keeps its position
+      for dimensionality in {previous_context.dimensionality, context.dimensionality}:
+        self._contexts_by_dimensionality[dimensionality] = [other_context for other_context in self._contexts.values() if other_context.dimensionality == dimensionality]
+    else:
+      # Replaced rather than appended to as the list may be shared with a parent registry
+      self._contexts_by_dimensionality[context.dimensionality] = [*self._contexts_by_dimensionality.get(context.dimensionality, list()), context]
+
+  def _index_base_units(self):
+    # The base unit of a dimension is the first unit with that sole dimension, no offset and a unit value
+    units = self._prefix_index.coherent_units() if (self._prefix_index is not None) else self._units_by_name.values()
+
+    self._base_options = dict()
+    self._base_units = dict()
+
+    for unit in units:
+      if (dimension := get_coherent_dimension(unit.dimensionality, unit.offset, unit.value)) is not None:
+        self._base_units.setdefault(dimension, unit)
+
+  def _base_option(self, dimensionality: Dimensionality, /):
+    if (option := self._base_options.get(dimensionality)) is not None:
+      return option
+
+    assembly = [UnitAssemblyConstantPart(self._base_units[dimension], power) for dimension, power in dimensionality.items()]
+    assembly = tuple(sorted(assembly, key=(lambda part: -part.power)))
+
+    return self._base_options.setdefault(dimensionality, ContextVariantOption(assembly, self._numeric.convert(1)))
+
+  def _base_converter(self, target: Unit | str, /):
+    cache = self._caches['converter']
+    key = (None, target)
+
+    if (converter := cache.get(key)) is None:
+      converter = self._create_converter(None, self.parse_unit(target))
+      cache.put(key, converter)
+
+    return converter
+
+  def _create_converter(self, source: Optional[Unit], target: Unit, /):
+    if ((source is not None) and not self._derives_from(source.registry)) or not self._derives_from(target.registry):
+      raise ValueError("Operation with different registries")
+
+    if (source is not None) and (source.dimensionality != target.dimensionality):
+      raise ValueError("Operation with different dimensionalities")
+
+    zero = self._numeric.convert(0)
+    source_scale = source.value if (source is not None) else self._numeric.convert(1)
+    source_offset = source.offset if isinstance(source, AtomicUnit) else zero
+    target_offset = target.offset if isinstance(target, AtomicUnit) else zero
+
+    scale = source_scale / target.value
+    offset = (source_offset - target_offset) / target.value
+
+    return Converter(
+      convert=self._numeric.convert,
+      dimensionality=target.dimensionality,
+      offset=offset,
+      scale=scale,
+      offset_float=float(offset),
+      scale_float=float(scale)
+    )
+
+  def _derives_from(self, other: 'UnitRegistry', /):
+    registry = self
+
+    while registry is not None:
+      if registry is other:
+        return True
+
+      registry = registry._parent
+
+    return False
+
+  def _merge(self, other: 'UnitRegistry', /):
+    # Objects of an overlay and of its ancestors may be combined, with the result belonging to the overlay
+    if (other is self) or self._derives_from(other):
+      return self
+
+    if other._derives_from(self):
+      return other
+
+    raise ValueError("Operation with different registries")
+
+  def _clear_fingerprint(self):
+    if self._fingerprint is not None:
+      from .snapshot import registries_by_fingerprint
+
+      if registries_by_fingerprint.get(self._fingerprint) is self:
+        del registries_by_fingerprint[self._fingerprint]
+
+      self._fingerprint = None
+
+  def _extend(self, data: 'RegistryData', /) -> 'RegistryChanges':
+    from .loader import extend_registry
+    from .parser import REGEXP_UNIT
+
+    changes = extend_registry(self, data, prefix_index=self._prefix_index)
+
+    if changes.replaced_names:
+      self._index_base_units()
+    else:
+      for unit in changes.units:
+        if (dimension := get_coherent_dimension(unit.dimensionality, unit.offset, unit.value)) is not None:
+          self._base_units.setdefault(dimension, unit)
+
+    # Cached entries are only evicted if they mention a name which now refers to another unit or group
+    if (names := changes.group_names | changes.replaced_names):
+      def affected(key: Any, /):
+        return any(isinstance(item, str) and not names.isdisjoint(REGEXP_UNIT.findall(item)) for item in (key if isinstance(key, tuple) else (key,)))
+
+      for cache in self._caches.values():
+        cache.remove_if(affected)
+
+    # The registry no longer matches the file it was loaded from
+    self._clear_fingerprint()
+
+    return changes
+
+  def _find_unit(self, name: str, /):
+    unit = self._units_by_name.get(name)
+
+    if (unit is None) and (self._prefix_index is not None) and (unit := self._prefix_index.find(name)):
+      self._units_by_name[name] = unit
+
+    return unit
+
+  def _find_unit_group(self, name: str, /):
+    group = self._unit_groups.get(name)
+
+    if (group is not None) and (self._prefix_index is not None):
+      self._prefix_index.expand_group(name, group)
+
+    return group
+
+  def _materialize_all(self):
+    if self._prefix_index is not None:
+      self._prefix_index.materialize(self)
+      self._prefix_index = None
+
+  def _dimensionless(self, value: Number, /):
     return Quantity(
       dimensionality=Dimensionality(),
       registry=self,
-      value=Decimal(value)
+      value=self._numeric.convert(value)
     )
 
+  def converter(self, source: Unit | str, target: Unit | str, /):
+    cache = self._caches['converter']
+    key = (source, target)
+
+    if (converter := cache.get(key)) is None:
+      converter = self._create_converter(self.parse_unit(source), self.parse_unit(target))
+      cache.put(key, converter)
+
+    return converter
+
+  def format_many(
+      self,
+      values: 'Sequence[Quantity] | QuantityArray | np.ndarray | Sequence[float]',
+      context_name: Context | ContextName | str,
+      *,
+      resolution: Optional[Quantity] = None,
+      style: Literal['label', 'symbol'] = 'symbol',
+      system: SystemName = SystemName("SI")
+    ):
+    from .array import format_many
+
+    context = context_name if isinstance(context_name, Context) else self._contexts[ContextName(context_name)]
+    return format_many(self, values, context, resolution=resolution, style=style, system=system)
+
+  def add_context(self, name: str, options: Sequence[str] | Mapping[str, Sequence[str]], /):
+    if isinstance(options, Mapping):
+      variants = [{ 'options': list(system_options), 'systems': [system_name] } for system_name, system_options in options.items()]
+    else:
+      variants = [{ 'options': list(options) }]
+
+    self._extend({ 'contexts': [{ 'name': name, 'variants': variants }] }) # type: ignore
+    return self._contexts[ContextName(name)]
+
+  def add_prefix_system(self, name: str, prefixes: Sequence[Mapping[str, Any]] = tuple(), /, *, extend: Sequence[str] = tuple()):
+    self._extend({ 'prefix_systems': [{
+      'extend': list(extend),
+      'name': name,
+      'prefixes': [{ **prefix, 'factor': self._numeric.convert(prefix['factor']) } for prefix in prefixes] # type: ignore
+    }] })
+
+  def add_unit(
+      self,
+      label: str | tuple[str, str],
+      symbol: str | tuple[str, str],
+      value: 'Number | Quantity' = 1,
+      /, *,
+      dimensionality: Optional[Mapping[str, Number]] = None,
+      label_names: Optional[Sequence[str]] = None,
+      offset: Number = 0,
+      prefixes: Sequence[str] = tuple(),
+      symbol_names: Optional[Sequence[str]] = None
+    ):
+    data_dimensionality = dict[str, Any](dimensionality or dict())
+
+    # Units may be defined from a quantity, as in add_unit('furlong', 'fur', Decimal('201.168') * registry.m)
+    if isinstance(value, Quantity):
+      if not self._derives_from(value.registry):
+        raise ValueError("Operation with different registries")
+
+      data_dimensionality = { dimension: power for dimension, power in value.dimensionality.items() }
+      value = value.value
+
+    data_unit: dict[str, Any] = {
+      'dimensionality': data_dimensionality,
+      'label': list(label) if isinstance(label, tuple) else label,
+      'offset': self._numeric.convert(offset),
+      'prefixes': list(prefixes),
+      'symbol': list(symbol) if isinstance(symbol, tuple) else symbol,
+      'value': self._numeric.convert(value)
+    }
+
+    if label_names is not None:
+      data_unit['label_names'] = list(label_names)
+
+    if symbol_names is not None:
+      data_unit['symbol_names'] = list(symbol_names)
+
+    return self._extend({ 'units': [data_unit] }).units[0] # type: ignore
+
+  def extend(self, source: str | bytes | IO[bytes], /):
+    import tomllib
+
+    if not isinstance(source, (str, bytes)):
+      source = source.read()
+
+    self._extend(tomllib.loads(source.decode() if isinstance(source, bytes) else source, parse_float=self._numeric.parse)) # type: ignore
+
+  def overlay(self):
+    # Caches are not shared as the entries of the parent may refer to names redefined by the overlay
+    self._materialize_all()
+
+    overlay = self.__class__.__new__(self.__class__, numeric=self._numeric.name)
+    overlay._parent = self
+
+    for name in OVERLAY_TABLES:
+      setattr(overlay, name, ChainMap(dict(), getattr(self, name)))
+
+    return overlay
+
+  def compile_expression(self, text: str, /, variables: Mapping[str, Unit | str] | Sequence[str] = tuple()):
+    from .expression import compile_expression
+    return compile_expression(self, text, variables)
+
   def get_context(self, string: Context | str, /):
+    from snaptext import LocatedString
+
     from .parser import ParserError
 
     if isinstance(string, Context):
@@ -497,44 +1084,165 @@ class UnitRegistry:
 
     return self._contexts[string]
 
+  def cache_info(self):
+    return { name: cache.info() for name, cache in self._caches.items() }
+
+  def clear_caches(self):
+    for cache in self._caches.values():
+      cache.clear()
+
+  def stats(self):
+    from .instrumentation import get_stats
+    return get_stats(self)
+
+  def memory_report(self):
+    from .memory import get_memory_report
+    return get_memory_report(self)
+
+  def resize_caches(self, maxsize: int, /):
+    for cache in self._caches.values():
+      cache.resize(maxsize)
+
   def parse_assembly_as_context(self, string: str, /):
+    cache = self._caches['assembly']
+
+    if (context := cache.get(string)) is None:
+      context = self._parse_assembly_as_context(string)
+      cache.put(string, context)
+
+    return context
+
+  def _parse_assembly_as_context(self, string: str, /):
+    from snaptext import LocatedString
+
     from .parser import tokenize
 
     walker = tokenize(LocatedString(string), self)
     assembly, dimensionality = walker.expect_only(walker.accept_assembly())
 
     if assembly.variable_part:
-      assemblies = [[*assembly.before_variable_parts, UnitAssemblyConstantPart(unit, assembly.variable_part.power), *assembly.after_variable_parts] for unit in assembly.variable_part.units]
+      assemblies = [(*assembly.before_variable_parts, UnitAssemblyConstantPart(unit, assembly.variable_part.power), *assembly.after_variable_parts) for unit in assembly.variable_part.units]
     else:
       assemblies = [assembly.before_variable_parts]
 
     return Context(
       dimensionality,
       [ContextVariant(
-        [ContextVariantOption(
+        tuple(ContextVariantOption(
           assembly,
           functools.reduce(operator.mul, [part.unit.value ** part.power for part in assembly])
-        ) for assembly in assemblies],
+        ) for assembly in assemblies),
         systems={SystemName("SI")},
       )]
     )
 
   def parse_quantity(self, string: str, /):
-    from .parser import tokenize
+    from .parser import REGEXP_SCALAR, parse_scalar
+
+    # The unit part is cached on the text following the leading scalar, which is tokenized identically
+    # regardless of the scalar's value.
+    cache = self._caches['quantity_unit']
+    match = REGEXP_SCALAR.match(string, len(string) - len(string.lstrip(' ')))
+    remainder = string[match.end():] if match else None
+
+    if match and ((unit := cache.get(remainder, CACHE_MISS)) is not CACHE_MISS):
+      scalar = parse_scalar(match.group())
+      return (scalar * cast(Unit, unit)) if (unit is not None) else self._dimensionless(scalar)
+
+    scalar, unit = self._parse_quantity_parts(string)
+
+    if remainder is not None:
+      cache.put(remainder, unit)
+
+    return (scalar * unit) if (unit is not None) else self._dimensionless(scalar)
+
+  def _parse_quantity_parts(self, string: str, /):
+    from snaptext import LocatedString
+
+    from .parser import ParserError, tokenize
 
     walker = tokenize(LocatedString(string), self)
-    return walker.expect_only(walker.accept_quantity())
+    scalar = walker.accept_scalar()
 
-  def parse_unit(self, string: Unit | str, /):
-    from .parser import tokenize
+    if scalar is None:
+      raise ParserError("Invalid token", walker.peek_area())
+
+    unit = walker.accept_composite_unit()
+    walker.expect_eof()
+
+    # Units inherited from a parent registry are rehomed so that parsed quantities belong to this registry
+    if (unit is not None) and (unit.registry is not self):
+      unit = replace(unit, registry=self)
+
+    return scalar, unit
+
+  def _iter_parse_quantity_parts(self, values: Iterable[str], errors: Optional[list[RowError]], /, start: int = 0):
+    from .parser import REGEXP_SCALAR, ParserError, parse_scalar
 
+    # Units are resolved once per distinct text following the scalar, with the table being reset
+    # whenever it grows too large to keep memory bounded on columns with many distinct units
+    units = dict[str, Optional[Unit]]()
+
+    for index, string in enumerate(values, start=start):
+      # Lines read from files keep their line endings
+      string = string.rstrip('\r\n')
+
+      match = REGEXP_SCALAR.match(string, len(string) - len(string.lstrip(' ')))
+      remainder = string[match.end():] if match else None
+      unit = units.get(remainder, CACHE_MISS) if (remainder is not None) else CACHE_MISS
+
+      try:
+        if match and (unit is not CACHE_MISS):
+          scalar = parse_scalar(match.group())
+        else:
+          scalar, unit = self._parse_quantity_parts(string)
+
+          if remainder is not None:
+            if len(units) >= self.CACHE_SIZE:
+              units.clear()
+
+            units[remainder] = unit
+      # Scalars rejected by ast.literal_eval(), such as those with leading zeros, raise SyntaxError or ValueError
+      except (ParserError, SyntaxError, ValueError) as e:
+        if errors is not None:
+          errors.append(RowError(e, index, string))
+
+        yield None
+        continue
+
+      yield scalar, cast(Optional[Unit], unit)
+
+  def iter_parse_quantities(self, values: Iterable[str], /, *, errors: Optional[list[RowError]] = None):
+    for parts in self._iter_parse_quantity_parts(values, errors):
+      if parts is None:
+        yield None
+      else:
+        scalar, unit = parts
+        yield (scalar * unit) if (unit is not None) else self._dimensionless(scalar)
+
+  def parse_unit(self, string: Unit | str, /):
     if isinstance(string, Unit):
       return string
 
+    cache = self._caches['unit']
+
+    if (unit := cache.get(string)) is None:
+      unit = self._parse_unit(string)
+      cache.put(string, unit)
+
+    return unit
+
+  def _parse_unit(self, string: str, /):
+    from snaptext import LocatedString
+
+    from .parser import tokenize
+
     walker = tokenize(LocatedString(string), self)
     return walker.expect_only(walker.accept_composite_unit())
 
   def serialize(self):
+    self._materialize_all()
+
     return {
       "contexts": {
         context_name: context.serialize() for context_name, context in self._contexts.items()
@@ -549,37 +1257,92 @@ class UnitRegistry:
       }
     }
 
+  def deserialize_quantity(self, data: Any, /):
+    from .serialization import deserialize_quantity
+    return deserialize_quantity(self, data)
+
+  def deserialize_quantities(self, data: bytes | memoryview, /):
+    from .serialization import decode_quantities
+    return decode_quantities(self, data)
+
   def unit(self, name: str, /):
-    if not name in self._units_by_name:
+    if (unit := self._find_unit(name)) is None:
       raise InvalidUnitNameError(f"Invalid unit name: {name}")
 
-    return self._units_by_name[name]
+    return unit
 
   def __getattr__(self, name: str, /):
-    if name in self._units_by_name:
-      return self._units_by_name[name]
+    if (unit := self._find_unit(name)) is not None:
+      return unit
 
     raise AttributeError(f"Invalid unit name: '{name}'")
 
   def __getstate__(self):
-    return dict() if self is self._default else self.__dict__
+    if self is self._default:
+      return dict()
+
+    # Overlays only pickle their own additions, along with their parent
+    if self._parent is not None:
+      return { **self.__dict__, **{ name: table.maps[0] for name in OVERLAY_TABLES if isinstance(table := getattr(self, name), ChainMap) } }
+
+    return self.__dict__
+
+  def __setstate__(self, state: dict[str, Any], /):
+    self.__dict__.update(state)
+
+    if self._parent is not None:
+      for name in OVERLAY_TABLES:
+        setattr(self, name, ChainMap(getattr(self, name), getattr(self._parent, name)))
 
   def __getnewargs_ex__(self):
     return tuple(), dict(_default=(self is self._default))
 
+  def __reduce_ex__(self, protocol: Any, /):
+    # Registries loaded from a file which other processes can load as well are pickled by reference to
+    # their contents, others with their full state
+    if (self._fingerprint is not None) and (self is not self._default):
+      from .snapshot import get_registry_reference, resolve_registry
+
+      if (reference := get_registry_reference(self)) is not None:
+        return resolve_registry, reference
+
+    return super().__reduce_ex__(protocol)
+
 
   @classmethod
   def get_default(cls):
-    return cls._default if cls._default is not None else cls.load_default()
+    if (default := cls._default) is not None:
+      return default
+
+    with cls._default_lock:
+      if (default := cls._default) is None:
+        default = cls._default = cls.load_default()
+
+      return default
+
+  @classmethod
+  def set_default(cls, registry: Optional['UnitRegistry'], /):
+    with cls._default_lock:
+      cls._default = registry
 
   @classmethod
-  def load(cls, file: IO[bytes], /):
-    from .loader import load
-    return load(cls, file)
+  def load(cls, file: IO[bytes], /, *, cache: bool = True, lazy_prefixes: bool = False, numeric: NumericBackendName = 'decimal'):
+    from .snapshot import load_registry
+    return load_registry(cls, file, cache=cache, lazy_prefixes=lazy_prefixes, numeric=numeric)
 
   @classmethod
-  def load_default(cls):
-    return cls.load(files("quantops").joinpath("registry.toml").open("rb"))
+  def load_default(cls, *, cache: bool = True, lazy_prefixes: bool = False, numeric: NumericBackendName = 'decimal'):
+    from importlib.resources import files
+
+    with files("quantops").joinpath("registry.toml").open("rb") as file:
+      return cls.load(file, cache=cache, lazy_prefixes=lazy_prefixes, numeric=numeric)
+
+
+def reset_default_registry_lock():
+  UnitRegistry._default_lock = threading.RLock()
+
+if hasattr(os, 'register_at_fork'):
+  os.register_at_fork(after_in_child=reset_default_registry_lock)
 
 
 QuantityContext = Context
@@ -588,12 +1351,14 @@ QuantityContext = Context
 __all__ = [
   'AtomicUnit',
   'Context',
+  'Converter',
   'Dimensionality',
   'DimensionName',
   'InvalidUnitNameError',
   'PrefixSystemName',
   'Quantity',
   'QuantityContext',
+  'RowError',
   'SystemName',
   'Unit',
   'UnitRegistry'
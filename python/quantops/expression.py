@@ -0,0 +1,229 @@
+import functools
+import operator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, Sequence
+
+from .core import AtomicUnit, Dimensionality, Quantity, Unit, UnitRegistry
+from .numeric import SCALAR_TYPES, Number
+from .util import is_array
+
+if TYPE_CHECKING:
+  from .array import QuantityArray
+
+
+# Nodes of parsed expressions, with values expressed in base units
+
+@dataclass(frozen=True, slots=True)
+class ConstantNode:
+  dimensionality: Dimensionality
+  value: Number
+
+@dataclass(frozen=True, slots=True)
+class VariableNode:
+  dimensionality: Dimensionality
+  index: int
+
+@dataclass(frozen=True, slots=True)
+class ProductNode:
+  dimensionality: Dimensionality
+  factor: Number
+  terms: tuple[tuple['ExpressionNode', bool], ...]
+
+@dataclass(frozen=True, slots=True)
+class PowerNode:
+  base: 'ExpressionNode'
+  dimensionality: Dimensionality
+  exponent: Number
+
+@dataclass(frozen=True, slots=True)
+class SumNode:
+  dimensionality: Dimensionality
+  terms: tuple[tuple['ExpressionNode', bool], ...]
+
+ExpressionNode = ConstantNode | PowerNode | ProductNode | SumNode | VariableNode
+
+
+# Constructors folding constant operands
+
+def get_product_parts(node: ExpressionNode, registry: UnitRegistry, /) -> tuple[Number, tuple[tuple[ExpressionNode, bool], ...]]:
+  match node:
+    case ConstantNode(value=value):
+      return value, tuple()
+    case ProductNode(factor=factor, terms=terms):
+      return factor, terms
+    case _:
+      return registry._numeric.convert(1), ((node, False),)
+
+def create_product(left: ExpressionNode, right: ExpressionNode, registry: UnitRegistry, /, *, divide: bool = False) -> ExpressionNode:
+  left_factor, left_terms = get_product_parts(left, registry)
+  right_factor, right_terms = get_product_parts(right, registry)
+
+  if divide:
+    factor = left_factor / right_factor
+    terms = (*left_terms, *((term, not inverse) for term, inverse in right_terms))
+    dimensionality = left.dimensionality / right.dimensionality
+  else:
+    factor = left_factor * right_factor
+    terms = (*left_terms, *right_terms)
+    dimensionality = left.dimensionality * right.dimensionality
+
+  if not terms:
+    return ConstantNode(dimensionality, factor)
+
+  return ProductNode(dimensionality, factor, terms)
+
+def create_power(base: ExpressionNode, exponent: Number, registry: UnitRegistry, /) -> ExpressionNode:
+  from .numeric import convert_decimal
+
+  dimensionality = base.dimensionality ** convert_decimal(exponent)
+
+  if isinstance(base, ConstantNode):
+    return ConstantNode(dimensionality, registry._numeric.power(base.value, exponent))
+
+  return PowerNode(base, dimensionality, exponent)
+
+def create_sum(left: ExpressionNode, right: ExpressionNode, /, *, subtract: bool = False) -> ExpressionNode:
+  if isinstance(left, ConstantNode) and isinstance(right, ConstantNode):
+    return ConstantNode(left.dimensionality, (left.value - right.value) if subtract else (left.value + right.value))
+
+  left_terms = left.terms if isinstance(left, SumNode) else ((left, False),)
+  return SumNode(left.dimensionality, (*left_terms, (right, subtract)))
+
+
+# Creates a function evaluating the node from the list of variable values, with constants converted
+# beforehand so that they can be provided either as numbers of the registry's backend or as floats
+
+Kernel = Callable[[Sequence[Any]], Any]
+
+def create_kernel(node: ExpressionNode, convert: Callable[[Number], Any], power: Callable[[Any, Any], Any], /) -> Kernel:
+  match node:
+    case ConstantNode(value=value):
+      constant = convert(value)
+      return lambda values: constant
+    case VariableNode(index=index):
+      return operator.itemgetter(index)
+    case PowerNode(base=base, exponent=exponent):
+      base_kernel = create_kernel(base, convert, power)
+      converted_exponent = convert(exponent)
+      return lambda values: power(base_kernel(values), converted_exponent)
+    case ProductNode(factor=factor, terms=terms):
+      numerator = [create_kernel(term, convert, power) for term, inverse in terms if not inverse]
+      denominator = [create_kernel(term, convert, power) for term, inverse in terms if inverse]
+
+      if (factor != 1) or (not numerator):
+        numerator.insert(0, create_kernel(ConstantNode(node.dimensionality, factor), convert, power))
+
+      def product(kernels: list[Kernel], values: Sequence[Any], /):
+        result = kernels[0](values)
+
+        for kernel in kernels[1:]:
+          result = result * kernel(values)
+
+        return result
+
+      if denominator:
+        return lambda values: product(numerator, values) / product(denominator, values)
+
+      return functools.partial(product, numerator)
+    case SumNode(terms=terms):
+      first_kernel = create_kernel(terms[0][0], convert, power)
+      other_kernels = [(create_kernel(term, convert, power), subtract) for term, subtract in terms[1:]]
+
+      def add(values: Sequence[Any], /):
+        result = first_kernel(values)
+
+        for kernel, subtract in other_kernels:
+          result = (result - kernel(values)) if subtract else (result + kernel(values))
+
+        return result
+
+      return add
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledExpression:
+  dimensionality: Dimensionality
+  registry: UnitRegistry
+  variables: tuple[str, ...]
+
+  _array_kernel: Kernel
+  _scalar_kernel: Kernel
+  _units: tuple[Optional[Unit], ...]
+
+  def _bind(self, index: int, value: Any, /, *, array: bool):
+    from .array import QuantityArray
+
+    unit = self._units[index]
+    dimensionality = unit.dimensionality if unit else Dimensionality()
+
+    if isinstance(value, (Quantity, QuantityArray)):
+      if value.dimensionality is not dimensionality:
+        raise ValueError(f"Dimensionality mismatch for variable '{self.variables[index]}'")
+
+      return float(value.value) if (array and isinstance(value, Quantity)) else value.value
+
+    # Values given as numbers are readings in the unit of the variable, and therefore include its offset
+    offset = unit.offset if isinstance(unit, AtomicUnit) else 0
+
+    if array:
+      import numpy as np
+
+      value = np.asarray(value, dtype=np.float64)
+      value = value * float(unit.value) if unit else value
+      return (value + float(offset)) if offset else value
+
+    value = self.registry._numeric.convert(value)
+    value = value * unit.value if unit else value
+    return (value + offset) if offset else value
+
+  def __call__(self, *args: Any, **kwargs: Any) -> 'Quantity | QuantityArray':
+    values = list(args)
+
+    if len(values) > len(self.variables):
+      raise TypeError("Too many arguments")
+
+    for name in self.variables[len(values):]:
+      if not name in kwargs:
+        raise TypeError(f"Missing variable '{name}'")
+
+      values.append(kwargs.pop(name))
+
+    if kwargs:
+      raise TypeError(f"Unknown variable '{next(iter(kwargs))}'")
+
+    array = any(is_array(value) or (not isinstance(value, (*SCALAR_TYPES, Quantity))) for value in values)
+    bound_values = [self._bind(index, value, array=array) for index, value in enumerate(values)]
+
+    if array:
+      from .array import QuantityArray
+      return QuantityArray(self.dimensionality, self.registry, self._array_kernel(bound_values))
+
+    return Quantity(dimensionality=self.dimensionality, registry=self.registry, value=self._scalar_kernel(bound_values))
+
+  def __repr__(self):
+    return f"{self.__class__.__name__}({', '.join(self.variables)})"
+
+
+def compile_expression(registry: UnitRegistry, text: str, /, variables: Mapping[str, Unit | str] | Sequence[str] = tuple()):
+  from snaptext import LocatedString
+
+  from .parser import tokenize
+
+  # Variables listed without a unit are dimensionless
+  units = { name: registry.parse_unit(unit) for name, unit in variables.items() } if isinstance(variables, Mapping) else dict.fromkeys(variables)
+  names = tuple(units)
+
+  walker = tokenize(LocatedString(text), registry, arithmetic=True)
+  node = walker.expect_only(walker.accept_expression({
+    name: (index, unit.dimensionality if unit else Dimensionality()) for index, (name, unit) in enumerate(units.items())
+  }))
+
+  scalar_kernel = create_kernel(node, lambda value: value, registry._numeric.power)
+  array_kernel = create_kernel(node, float, pow)
+
+  return CompiledExpression(node.dimensionality, registry, names, array_kernel, scalar_kernel, tuple(units.values()))
+
+
+__all__ = [
+  'CompiledExpression'
+]
@@ -2,7 +2,8 @@ import json
 import sys
 
 from .core import UnitRegistry
+from .serialization import json_default
 
 
 ureg = UnitRegistry.get_default()
-json.dump(ureg.serialize(), sys.stdout, separators=(',', ':'))
+json.dump(ureg.serialize(), sys.stdout, default=json_default, separators=(',', ':'))
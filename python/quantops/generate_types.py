@@ -7,8 +7,11 @@ def generate_types(name: str, ureg: UnitRegistry):
   output = f'from {UnitRegistry.__module__} import {AtomicUnit.__name__}, {UnitRegistry.__name__}\n\n'
   output += f'class {name}({UnitRegistry.__name__}):\n'
 
+  ureg._materialize_all()
+
   for name in ureg._units_by_name.keys():
-    output += f'  {name}: {AtomicUnit.__name__}\n'
+    if name.isidentifier():
+      output += f'  {name}: {AtomicUnit.__name__}\n'
 
   output += '\n\n'
 
@@ -0,0 +1,192 @@
+import contextvars
+import functools
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .core import Quantity, Unit, UnitRegistry
+
+
+# Receives the registry involved, if any, the name of the operation and its duration in seconds
+Hook = Callable[[Optional[UnitRegistry], str, float], None]
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+  hits: int
+  misses: int
+
+  @property
+  def hit_rate(self):
+    return (self.hits / total) if (total := self.hits + self.misses) > 0 else 0.0
+
+@dataclass(frozen=True, slots=True)
+class OperationStats:
+  count: int
+  total_time: float
+
+  @property
+  def mean_time(self):
+    return (self.total_time / self.count) if self.count > 0 else 0.0
+
+
+hooks = list[Hook]()
+lock = threading.Lock()
+
+# Counts and total durations of operations, by registry and then by operation name
+operation_counters = weakref.WeakKeyDictionary[UnitRegistry, dict[str, list[Any]]]()
+
+# Original attributes replaced while enabled, by owner and attribute name
+originals = dict[tuple[Any, str], Any]()
+
+# Whether an instrumented operation is running in the current thread or task, in which case the
+# operations it calls are only accounted for as part of it, except for nested operations
+active = contextvars.ContextVar('active', default=False)
+
+# Operations which are recorded on their own even when called by another instrumented operation
+NESTED_OPERATIONS = {'parser.tokenize'}
+
+
+def record(registry: Optional[UnitRegistry], name: str, duration: float, /):
+  if registry is not None:
+    with lock:
+      counter = operation_counters.setdefault(registry, dict()).setdefault(name, [0, 0.0])
+      counter[0] += 1
+      counter[1] += duration
+
+  for hook in hooks:
+    # Errors of hooks are logged rather than raised, which would mask the outcome of the operation
+    try:
+      hook(registry, name, duration)
+    except Exception:
+      import logging
+      logging.getLogger(__name__).exception("Instrumentation hook failed")
+
+def instrument(function: Callable[..., Any], name: str, get_registry: Callable[[tuple[Any, ...], Any], Optional[UnitRegistry]], /, *, nested: bool = False):
+  @functools.wraps(function)
+  def wrapper(*args: Any, **kwargs: Any):
+    outer = not active.get()
+
+    if not (outer or nested):
+      return function(*args, **kwargs)
+
+    result = None
+    token = active.set(True) if outer else None
+    start = time.perf_counter()
+
+    try:
+      result = function(*args, **kwargs)
+    finally:
+      duration = time.perf_counter() - start
+
+      if token is not None:
+        active.reset(token)
+
+      record(get_registry(args, result), name, duration)
+
+    return result
+
+  return wrapper
+
+
+def get_self_registry(args: tuple[Any, ...], result: Any, /):
+  return args[0]
+
+def get_object_registry(args: tuple[Any, ...], result: Any, /):
+  return args[0].registry
+
+def get_result_registry(args: tuple[Any, ...], result: Any, /):
+  return result if isinstance(result, UnitRegistry) else None
+
+def get_tokenize_registry(args: tuple[Any, ...], result: Any, /):
+  return args[1]
+
+def get_targets():
+  from . import parser
+
+  return [
+    (UnitRegistry, 'load', get_result_registry),
+    (UnitRegistry, 'parse_quantity', get_self_registry),
+    (UnitRegistry, 'parse_unit', get_self_registry),
+    (parser, 'tokenize', get_tokenize_registry),
+    *((Quantity, name, get_object_registry) for name in ('__add__', '__lt__', '__mul__', '__pow__', '__rmul__', '__rtruediv__', '__truediv__', 'format', 'magnitude_as')),
+    *((Unit, name, get_object_registry) for name in ('__mul__', '__pow__', '__rmul__', '__rtruediv__', '__truediv__'))
+  ]
+
+
+# Methods are only replaced while instrumentation is enabled, leaving no overhead otherwise
+def enable():
+  with lock:
+    if originals:
+      return
+
+    for owner, attribute_name, get_registry in get_targets():
+      original = vars(owner)[attribute_name]
+      name = f"{owner.__name__.rpartition('.')[2]}.{attribute_name}"
+      nested = name in NESTED_OPERATIONS
+
+      if isinstance(original, classmethod):
+        replacement = classmethod(instrument(original.__func__, name, get_registry, nested=nested))
+      else:
+        replacement = instrument(original, name, get_registry, nested=nested)
+
+      originals[owner, attribute_name] = original
+      setattr(owner, attribute_name, replacement)
+
+def disable():
+  with lock:
+    for (owner, attribute_name), original in originals.items():
+      setattr(owner, attribute_name, original)
+
+    originals.clear()
+
+def is_enabled():
+  return bool(originals)
+
+
+def add_hook(hook: Hook, /):
+  hooks.append(hook)
+
+def remove_hook(hook: Hook, /):
+  hooks.remove(hook)
+
+
+def get_stats(registry: UnitRegistry, /):
+  with lock:
+    operations = { name: OperationStats(count, total_time) for name, (count, total_time) in operation_counters.get(registry, dict()).items() }
+
+  return {
+    'caches': { name: CacheStats(info.hits, info.misses) for name, info in registry.cache_info().items() },
+    'operations': dict(sorted(operations.items()))
+  }
+
+def reset_stats(registry: Optional[UnitRegistry] = None, /):
+  with lock:
+    if registry is not None:
+      operation_counters.pop(registry, None)
+    else:
+      operation_counters.clear()
+
+
+def reset_lock():
+  global lock
+  lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+  os.register_at_fork(after_in_child=reset_lock)
+
+
+__all__ = [
+  'CacheStats',
+  'Hook',
+  'OperationStats',
+  'add_hook',
+  'disable',
+  'enable',
+  'get_stats',
+  'is_enabled',
+  'remove_hook',
+  'reset_stats'
+]
@@ -1,15 +1,22 @@
 import functools
 import operator
+import sys
 import tomllib
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import IO, NotRequired, Optional, TypedDict, cast
+from typing import IO, NotRequired, Optional, Sequence, TypedDict, cast
 
 from snaptext import LocatedString
 
 from .core import (AtomicUnit, ConstantUnitAssembly, Context, ContextName,
                    ContextVariant, ContextVariantOption, Dimensionality,
-                   DimensionName, Extent, ExtentName, SystemName,
-                   UnitAssemblyConstantPart, UnitRegistry)
+                   DimensionName, Extent, ExtentName, PrefixSystemName,
+                   SystemName, UnitAssemblyConstantPart, UnitRegistry,
+                   get_coherent_dimension)
+from .numeric import Number, NumericBackendName
+from .prefixes import (Prefix, PrefixIndex, PrefixSystem, UnitFamily,
+                       create_prefixed_unit, get_prefixed_names,
+                       register_unit)
 
 
 class RegistryContextVariantData(TypedDict):
@@ -25,7 +32,7 @@ class RegistryDimensionalityData(TypedDict):
   value: dict[str, int]
 
 class RegistryPrefixData(TypedDict):
-  factor: Decimal
+  factor: Number
   label: str
   symbol: str
   symbol_names: NotRequired[list[str]]
@@ -44,124 +51,214 @@ class RegistryUnitData(TypedDict):
 
   prefixes: NotRequired[list[str]]
 
-  offset: NotRequired[Decimal]
-  value: NotRequired[Decimal]
+  offset: NotRequired[Number]
+  value: NotRequired[Number]
 
 class RegistryData(TypedDict):
-  contexts: list[RegistryContextData]
-  dimensionalities: list[RegistryDimensionalityData]
-  prefix_systems: list[RegistryPrefixSystemData]
-  units: list[RegistryUnitData]
+  contexts: NotRequired[list[RegistryContextData]]
+  dimensionalities: NotRequired[list[RegistryDimensionalityData]]
+  prefix_systems: NotRequired[list[RegistryPrefixSystemData]]
+  units: NotRequired[list[RegistryUnitData]]
 
 
 def load_dimensionality(data: dict[str, int], /):
   return Dimensionality({ DimensionName(dimension): Decimal(power) for dimension, power in data.items() })
 
 
-def load(cls: type[UnitRegistry], file: IO[bytes], /) -> UnitRegistry:
-  from .parser import tokenize
+def load(cls: type[UnitRegistry], file: IO[bytes], /, *, lazy_prefixes: bool = False, numeric: NumericBackendName = 'decimal') -> UnitRegistry:
+  registry = cls(numeric=numeric)
 
-  data = cast(RegistryData, tomllib.load(file, parse_float=Decimal))
+  data = cast(RegistryData, tomllib.load(file, parse_float=registry._numeric.parse))
   # pprint(data)
 
-  def ensure_tuple(value: str | list[str], /):
-    return (value, value) if isinstance(value, str) else (value[0], value[1])
+  prefix_index = PrefixIndex(registry) if lazy_prefixes else None
+  extend_registry(registry, data, prefix_index=prefix_index)
+
+  registry._index_base_units()
+
+  return registry
+
+
+# Labels, symbols and names are interned so that units and the name tables share the same strings
+def ensure_tuple(value: str | list[str], /) -> tuple[str, str]:
+  if isinstance(value, str):
+    value = sys.intern(value)
+    return value, value
+
+  return sys.intern(value[0]), sys.intern(value[1])
+
+def load_prefixes(registry: UnitRegistry, prefix_system_names: list[str], /):
+  prefixes = list[Prefix]()
+  prefixsys_names = list(prefix_system_names)
+
+  while prefixsys_names:
+    prefixsys_name = prefixsys_names.pop()
+    prefix_system = registry._prefix_systems[PrefixSystemName(prefixsys_name)]
+
+    prefixsys_names += prefix_system.extend
+    prefixes += prefix_system.prefixes
+
+  return prefixes
 
-  registry = cls()
+# Options and tuples of options shared between contexts listing the same assemblies, keyed by the ids
+# of their units and options, which remain valid as the table holds on to them
+@dataclass(slots=True)
+class OptionTable:
+  options: dict[tuple[tuple[int, Decimal], ...], ContextVariantOption] = field(default_factory=dict)
+  tuples: dict[tuple[int, ...], tuple[ContextVariantOption, ...]] = field(default_factory=dict)
+
+def load_context(registry: UnitRegistry, name: str, data_variants: list[RegistryContextVariantData], table: OptionTable, /):
+  from .parser import tokenize
+
+  context_dimensionality: Optional[Dimensionality] = None
+  variants = list[ContextVariant]()
+
+  for data_variant in data_variants:
+    option_assemblies = list[ConstantUnitAssembly]()
+
+    for data_option in data_variant['options']:
+      walker = tokenize(LocatedString(data_option), registry)
+      assembly, option_dimensionality = walker.expect_only(walker.accept_assembly())
+
+      if context_dimensionality is None:
+        context_dimensionality = option_dimensionality
+      elif context_dimensionality != option_dimensionality:
+        raise ValueError("Invalid dimensionality")
+
+      if assembly.variable_part:
+        option_assemblies += [(*assembly.before_variable_parts, UnitAssemblyConstantPart(unit, assembly.variable_part.power), *assembly.after_variable_parts) for unit in assembly.variable_part.units]
+      else:
+        option_assemblies.append(assembly.before_variable_parts)
+
+    options = list[ContextVariantOption]()
+
+    for option_assembly in option_assemblies:
+      key = tuple((id(part.unit), part.power) for part in option_assembly)
+
+      if (option := table.options.get(key)) is None:
+        option = table.options[key] = ContextVariantOption(
+          option_assembly,
+          functools.reduce(operator.mul, [registry._numeric.power(part.unit.value, part.power) for part in option_assembly])
+        )
 
-  data_prefix_systems = {
-    data_prefix_system['name']: data_prefix_system for data_prefix_system in data['prefix_systems']
-  }
+      options.append(option)
 
-  for data_unit in data['units']:
+    variant_options = table.tuples.setdefault(tuple(map(id, options)), tuple(options))
+    variants.append(ContextVariant(variant_options, systems={ SystemName(name) for name in data_variant.get('systems', [SystemName("SI")]) }))
+
+  if context_dimensionality is None:
+    return None
+
+  return Context(context_dimensionality, variants, name=ContextName(name))
+
+
+@dataclass(slots=True)
+class RegistryChanges:
+  group_names: set[str] = field(default_factory=set)
+  replaced_names: set[str] = field(default_factory=set)
+  units: list[AtomicUnit] = field(default_factory=list)
+
+# Adds the contents of registry data to the registry, returning what changed so that callers
+# extending an existing registry can update its indexes and caches accordingly
+def extend_registry(registry: UnitRegistry, data: RegistryData, /, *, prefix_index: Optional[PrefixIndex] = None):
+  changes = RegistryChanges()
+
+  # Lazy registries being extended after they were loaded, rather than being loaded
+  extending_index = (prefix_index is not None) and (prefix_index is registry._prefix_index)
+
+  def add_unit(unit: AtomicUnit, names: Sequence[str], /):
+    changes.replaced_names.update(name for name in names if name in registry._units_by_name)
+    changes.units.append(unit)
+    register_unit(registry, unit, names)
+
+  for data_prefix_system in data.get('prefix_systems', list()):
+    registry._prefix_systems[PrefixSystemName(data_prefix_system['name'])] = PrefixSystem(
+      extend=tuple(data_prefix_system.get('extend', list())),
+      name=data_prefix_system['name'],
+      prefixes=tuple(Prefix(
+        factor=data_prefix['factor'],
+        label=data_prefix['label'],
+        symbol=data_prefix['symbol'],
+        symbol_names=tuple(data_prefix.get('symbol_names', [data_prefix['symbol']]))
+      ) for data_prefix in data_prefix_system.get('prefixes', list()))
+    )
+
+  for data_unit in data.get('units', list()):
     unit_symbol = ensure_tuple(data_unit['symbol'])
     unit = AtomicUnit(
       dimensionality=load_dimensionality(data_unit['dimensionality']),
       label=ensure_tuple(data_unit['label']),
       symbol=unit_symbol,
-      offset=data_unit.get('offset', Decimal(0.0)),
+      offset=data_unit.get('offset', registry._numeric.convert(0)),
       registry=registry,
-      value=data_unit.get('value', Decimal(1.0))
+      value=data_unit.get('value', registry._numeric.convert(1))
     )
 
-    registry._units_by_id[unit.id] = unit
+    label_names = tuple(map(sys.intern, data_unit.get('label_names', unit.label)))
+    symbol_names = tuple(map(sys.intern, data_unit.get('symbol_names', unit_symbol)))
 
-    for name in [*data_unit.get('label_names', unit.label), *data_unit.get('symbol_names', unit_symbol)]:
-      registry._units_by_name[name] = unit
+    add_unit(unit, (*label_names, *symbol_names))
 
+    prefixes = load_prefixes(registry, data_unit.get('prefixes', list()))
     all_units = {unit}
-    prefixsys_names = data_unit.get('prefixes', list())
-
-    while prefixsys_names:
-      prefixsys_name = prefixsys_names.pop()
-      data_prefix_system = data_prefix_systems[prefixsys_name]
-
-      prefixsys_names += data_prefix_system.get('extend', list())
-
-      for data_prefix in data_prefix_system.get('prefixes', list()):
-        prefixed_unit = AtomicUnit(
-          dimensionality=unit.dimensionality,
-          offset=unit.offset,
-          label=(data_prefix['label'] + unit.label[0], data_prefix['label'] + unit.label[1]),
-          registry=registry,
-          symbol=(data_prefix['symbol'] + unit_symbol[0], data_prefix['symbol'] + unit_symbol[1]),
-          value=(data_prefix['factor'] * unit.value)
-        )
 
-        registry._units_by_id[prefixed_unit.id] = prefixed_unit
+    if prefix_index is not None:
+      # Prefixed units are only created once looked up by name or through their group
+      family = UnitFamily(len(prefix_index.families), unit, label_names, symbol_names, tuple(prefixes))
 
-        for name in data_unit.get('label_names', unit.label):
-          registry._units_by_name[data_prefix['label'] + name] = prefixed_unit
+      if extending_index:
+        for prefix in prefixes:
+          changes.replaced_names |= prefix_index.shadow(registry, get_prefixed_names(prefix, label_names, symbol_names))
 
-        for symbol_name in data_unit.get('symbol_names', unit_symbol):
-          for prefix_name in data_prefix.get('symbol_names', [data_prefix['symbol']]):
-            registry._units_by_name[prefix_name + symbol_name] = prefixed_unit
+        # Candidates for base units
+        changes.units += [
+          family.materialize(position) for position, prefix in enumerate(prefixes)
+            if get_coherent_dimension(unit.dimensionality, unit.offset, prefix.factor * unit.value) is not None
+        ]
 
+      prefix_index.add(family)
+      pending_families = [family] if prefixes else list()
+    else:
+      pending_families = list()
+
+      for prefix in prefixes:
+        prefixed_unit = create_prefixed_unit(unit, prefix)
+        add_unit(prefixed_unit, get_prefixed_names(prefix, label_names, symbol_names))
         all_units.add(prefixed_unit)
 
     if len(unit.dimensionality) == 1:
       dimension_name, dimension_factor = next(iter(unit.dimensionality.items()))
 
       if dimension_factor == 1:
-        registry._unit_groups.setdefault(dimension_name, set()).update(all_units)
-
-    registry._unit_groups[unit_symbol[0]] = all_units
-
-  for data_context in data['contexts']:
-    context_dimensionality: Optional[Dimensionality] = None
-    variants = list[ContextVariant]()
-
-    for data_variant in data_context['variants']:
-      option_assemblies = list[ConstantUnitAssembly]()
+        if dimension_name in changes.group_names:
+          registry._unit_groups[dimension_name].update(all_units)
+        else:
+          # Copied on the first change of each call as the group may be shared with a parent registry
+          registry._unit_groups[dimension_name] = registry._unit_groups.get(dimension_name, set()) | all_units
+          changes.group_names.add(dimension_name)
 
-      for data_option in data_variant['options']:
-        walker = tokenize(LocatedString(data_option), registry)
-        assembly, option_dimensionality = walker.expect_only(walker.accept_assembly())
+        if prefix_index is not None:
+          prefix_index.pending_groups.setdefault(dimension_name, list()).extend(pending_families)
 
-        if context_dimensionality is None:
-          context_dimensionality = option_dimensionality
-        elif context_dimensionality != option_dimensionality:
-          raise ValueError("Invalid dimensionality")
+    registry._unit_groups[unit_symbol[0]] = all_units
+    changes.group_names.add(unit_symbol[0])
 
-        if assembly.variable_part:
-          option_assemblies += [[*assembly.before_variable_parts, UnitAssemblyConstantPart(unit, assembly.variable_part.power), *assembly.after_variable_parts] for unit in assembly.variable_part.units]
-        else:
-          option_assemblies.append(assembly.before_variable_parts)
+    if prefix_index is not None:
+      prefix_index.pending_groups[unit_symbol[0]] = pending_families
 
-      options = [ContextVariantOption(
-        option_assembly,
-        functools.reduce(operator.mul, [part.unit.value ** Decimal(part.power) for part in option_assembly])
-      ) for option_assembly in option_assemblies]
+  if prefix_index is not None:
+    prefix_index.finish(registry)
+    registry._prefix_index = prefix_index
 
-      variants.append(ContextVariant(options, systems={ SystemName(name) for name in data_variant.get('systems', [SystemName("SI")]) }))
+  option_table = OptionTable()
 
-    if context_dimensionality is None:
-      continue
+  for data_context in data.get('contexts', list()):
+    context = load_context(registry, data_context['name'], data_context['variants'], option_table)
 
-    context_name = ContextName(data_context['name'])
-    registry._contexts[context_name] = Context(context_dimensionality, variants, name=context_name)
+    if context is not None:
+      registry._add_context(context)
 
-  for data_dimensionality in data['dimensionalities']:
+  for data_dimensionality in data.get('dimensionalities', list()):
     dimensionality = load_dimensionality(data_dimensionality['value'])
     name = ExtentName(data_dimensionality['name'])
 
@@ -175,5 +272,4 @@ def load(cls: type[UnitRegistry], file: IO[bytes], /) -> UnitRegistry:
     registry._extents_by_dimensionality[dimensionality] = dim
     registry._extents_by_name[name] = dim
 
-
-  return registry
+  return changes
@@ -0,0 +1,86 @@
+import sys
+import types
+from collections import ChainMap
+from dataclasses import fields, is_dataclass
+from typing import Any, Iterable
+
+from .core import Context, UnitRegistry
+from .numeric import NumericBackend
+
+
+# Objects which are either shared by all registries or not owned by any
+OPAQUE_TYPES = (
+  NumericBackend,
+  UnitRegistry,
+  type,
+  types.BuiltinFunctionType,
+  types.FunctionType,
+  types.MethodType,
+  types.ModuleType
+)
+
+def iter_references(obj: Any, /) -> Iterable[Any]:
+  match obj:
+    case ChainMap():
+      # Overlays only own the first map, the others belonging to their ancestors
+      yield obj.maps[0]
+    case dict():
+      yield from obj.keys()
+      yield from obj.values()
+    case list() | tuple() | set() | frozenset():
+      yield from obj
+    case _ if is_dataclass(obj):
+      for obj_field in fields(obj):
+        yield getattr(obj, obj_field.name)
+    case _ if hasattr(obj, '__dict__'):
+      yield from vars(obj).values()
+
+
+class MemoryReport:
+  def __init__(self):
+    self.sizes = dict[str, int]()
+    self._seen = set[int]()
+
+  # Objects are attributed to the first kind under which they are reached
+  def visit(self, kind: str, *objs: Any):
+    stack = list(objs)
+    size = 0
+
+    while stack:
+      obj = stack.pop()
+
+      if (id(obj) in self._seen) or isinstance(obj, OPAQUE_TYPES):
+        continue
+
+      self._seen.add(id(obj))
+      size += sys.getsizeof(obj)
+      stack += iter_references(obj)
+
+    self.sizes[kind] = self.sizes.get(kind, 0) + size
+
+
+def get_memory_report(registry: UnitRegistry, /):
+  report = MemoryReport()
+
+  def own_values(table: Any, /) -> list[Any]:
+    return list((table.maps[0] if isinstance(table, ChainMap) else table).values())
+
+  units = own_values(registry._units_by_id) + own_values(registry._units_by_name)
+  contexts: list[Context] = own_values(registry._contexts)
+  options = [option for context in contexts for variant in context.variants for option in variant.options] + own_values(registry._base_options)
+
+  report.visit('dimensionalities', *(unit.dimensionality for unit in units), *(context.dimensionality for context in contexts))
+  report.visit('units', *units)
+  report.visit('unit_names', registry._units_by_id, registry._units_by_name, registry._unit_groups, registry._base_units)
+  report.visit('options', *options)
+  report.visit('format_plans', *(context._format_plans for context in contexts))
+  report.visit('contexts', registry._contexts, registry._contexts_by_dimensionality, registry._base_options, registry._extents_by_dimensionality, registry._extents_by_name)
+  report.visit('prefixes', registry._prefix_systems, registry._prefix_index)
+  report.visit('caches', registry._caches)
+
+  return { **report.sizes, 'total': sum(report.sizes.values()) }
+
+
+__all__ = [
+  'get_memory_report'
+]
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, Callable, Literal, Protocol, cast
+
+
+# Implemented by Decimal, Fraction, float and int, the values of a registry all sharing one of these
+# types, between which arithmetic is therefore well-defined
+class Number(Protocol):
+  def __abs__(self) -> 'Number': ...
+  def __add__(self, other: Any, /) -> 'Number': ...
+  def __float__(self) -> float: ...
+  def __ge__(self, other: Any, /) -> bool: ...
+  def __gt__(self, other: Any, /) -> bool: ...
+  def __le__(self, other: Any, /) -> bool: ...
+  def __lt__(self, other: Any, /) -> bool: ...
+  def __mul__(self, other: Any, /) -> 'Number': ...
+  def __neg__(self) -> 'Number': ...
+  def __pow__(self, other: Any, /) -> 'Number': ...
+  def __radd__(self, other: Any, /) -> 'Number': ...
+  def __rmul__(self, other: Any, /) -> 'Number': ...
+  def __rsub__(self, other: Any, /) -> 'Number': ...
+  def __rtruediv__(self, other: Any, /) -> 'Number': ...
+  def __sub__(self, other: Any, /) -> 'Number': ...
+  def __truediv__(self, other: Any, /) -> 'Number': ...
+
+
+NumericBackendName = Literal['decimal', 'float', 'fraction']
+
+SCALAR_TYPES = (Decimal, Fraction, float, int)
+
+
+def to_decimal(value: Number, /) -> Decimal:
+  match value:
+    case Decimal():
+      return value
+    case Fraction():
+      return Decimal(value.numerator) / Decimal(value.denominator)
+    case float():
+      # Formatted with the shortest representation which round-trips, as done by repr()
+      return Decimal(repr(value))
+    case _:
+      # Integers, including those of numpy
+      return Decimal(cast(int, value))
+
+
+def convert_decimal(value: Number, /) -> Decimal:
+  match value:
+    case Fraction():
+      return Decimal(value.numerator) / Decimal(value.denominator)
+    case Decimal() | float():
+      return Decimal(value)
+    case _:
+      return Decimal(cast(int, value))
+
+def convert_fraction(value: Number, /) -> Fraction:
+  match value:
+    case Decimal() | Fraction() | float():
+      return Fraction(value)
+    case _:
+      return Fraction(cast(int, value))
+
+def power_decimal(base: Number, exponent: Number, /) -> Decimal:
+  return base ** convert_decimal(exponent) # type: ignore
+
+def power_float(base: Number, exponent: Number, /):
+  return float(base) ** float(exponent)
+
+def power_fraction(base: Number, exponent: Number, /):
+  if (exponent := convert_fraction(exponent)).denominator == 1:
+    return convert_fraction(base) ** exponent.numerator
+
+  # Non-integer powers are generally irrational
+  return Fraction(float(base) ** float(exponent))
+
+
+@dataclass(frozen=True, slots=True)
+class NumericBackend:
+  name: NumericBackendName
+  convert: Callable[[Number], Number]
+  parse: Callable[[str], Number]
+  power: Callable[[Number, Number], Number]
+
+  def __reduce__(self):
+    return get_numeric_backend, (self.name,)
+
+  def __repr__(self):
+    return f"{self.__class__.__name__}({self.name!r})"
+
+
+NUMERIC_BACKENDS: dict[NumericBackendName, NumericBackend] = {
+  'decimal': NumericBackend('decimal', convert=convert_decimal, parse=Decimal, power=power_decimal),
+  'float': NumericBackend('float', convert=float, parse=float, power=power_float),
+  'fraction': NumericBackend('fraction', convert=convert_fraction, parse=Fraction, power=power_fraction)
+}
+
+def get_numeric_backend(name: NumericBackendName, /):
+  if not name in NUMERIC_BACKENDS:
+    raise ValueError(f"Invalid numeric backend: {name!r}")
+
+  return NUMERIC_BACKENDS[name]
+
+
+__all__ = [
+  'NumericBackend',
+  'NumericBackendName',
+  'get_numeric_backend'
+]
@@ -0,0 +1,164 @@
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+from typing import Any, Literal, Optional
+
+import numpy as np
+
+from .array import QuantityArray
+from .core import (Context, ContextName, Dimensionality, Quantity, SystemName,
+                   Unit, UnitRegistry)
+from .numeric import Number
+from .serialization import deserialize_context, serialize_batch_context
+
+
+# Set in each worker process by init_worker()
+worker_registry: Optional[UnitRegistry] = None
+
+def init_worker(registry: UnitRegistry, /):
+  # The registry is received once per worker, pickled by reference to its fingerprint when it can be
+  # loaded from a snapshot or is the default registry, and with its full state otherwise
+  global worker_registry
+  worker_registry = registry
+
+def attach_array(name: str, length: int, /):
+  memory = shared_memory.SharedMemory(name=name)
+  return memory, np.ndarray((length,), dtype=np.float64, buffer=memory.buf)
+
+# Tasks only receive plain values rather than units, contexts or quantities, which would otherwise
+# be pickled along with a copy of their registry when it is pickled with its full state
+
+def convert_chunk(input_name: str, output_name: str, length: int, start: int, stop: int, scale: float, offset: float, /):
+  input_memory, input_array = attach_array(input_name, length)
+  output_memory, output_array = attach_array(output_name, length)
+
+  try:
+    output_array[start:stop] = input_array[start:stop] * scale + offset
+  finally:
+    del input_array, output_array
+    input_memory.close()
+    output_memory.close()
+
+def format_chunk(
+    input_name: str,
+    length: int,
+    start: int,
+    stop: int,
+    dimensionality: Dimensionality,
+    context_data: dict[str, Any],
+    resolution_parts: Optional[tuple[Dimensionality, Number]],
+    style: Literal['label', 'symbol'],
+    system: SystemName,
+    /
+  ):
+  assert worker_registry is not None
+
+  context = deserialize_context(worker_registry, context_data)
+  resolution = None
+
+  if resolution_parts is not None:
+    resolution_dimensionality, resolution_value = resolution_parts
+    resolution = Quantity(resolution_dimensionality, worker_registry, resolution_value)
+
+  input_memory, input_array = attach_array(input_name, length)
+
+  try:
+    output = worker_registry.format_many(QuantityArray(dimensionality, worker_registry, input_array[start:stop]), context, resolution=resolution, style=style, system=system)
+  finally:
+    del input_array
+    input_memory.close()
+
+  # Returned as a single string rather than a list to avoid pickling each item separately
+  return "\0".join(output)
+
+
+# Runs conversions and formatting of large arrays of magnitudes, expressed in base units, across a pool
+# of worker processes, with magnitudes exchanged through shared memory
+class ParallelRunner:
+  def __init__(self, registry: UnitRegistry, /, *, chunk_size: int = 65536, max_workers: Optional[int] = None, mp_context: Optional[BaseContext] = None):
+    self.chunk_size = chunk_size
+    self.registry = registry
+
+    self._executor: Executor = ProcessPoolExecutor(max_workers, mp_context=mp_context, initializer=init_worker, initargs=(registry,))
+
+  def _chunks(self, length: int, /):
+    chunk_count = max(math.ceil(length / self.chunk_size), 1)
+    return [(index * self.chunk_size, min((index + 1) * self.chunk_size, length)) for index in range(chunk_count)]
+
+  def _share(self, magnitudes: Any, /):
+    values = np.ravel(np.asarray(magnitudes, dtype=np.float64))
+    memory = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+
+    array = np.ndarray(values.shape, dtype=np.float64, buffer=memory.buf)
+    array[:] = values
+
+    return memory, array
+
+  def convert(self, magnitudes: Any, dimensionality: Dimensionality, unit: Unit | str, /):
+    converter = self.registry._base_converter(unit)
+
+    if dimensionality is not converter.dimensionality:
+      raise ValueError("Operation with different dimensionalities")
+
+    input_memory, input_array = self._share(magnitudes)
+    output_memory = shared_memory.SharedMemory(create=True, size=max(input_array.nbytes, 1))
+    length = len(input_array)
+
+    try:
+      futures = [self._executor.submit(convert_chunk, input_memory.name, output_memory.name, length, start, stop, converter.scale_float, converter.offset_float) for start, stop in self._chunks(length)]
+
+      for future in futures:
+        future.result()
+
+      return np.ndarray((length,), dtype=np.float64, buffer=output_memory.buf).copy()
+    finally:
+      del input_array
+
+      for memory in (input_memory, output_memory):
+        memory.close()
+        memory.unlink()
+
+  def format_many(
+      self,
+      magnitudes: Any,
+      dimensionality: Dimensionality,
+      context: Context | ContextName | str,
+      *,
+      resolution: Optional[Quantity] = None,
+      style: Literal['label', 'symbol'] = 'symbol',
+      system: SystemName = SystemName("SI")
+    ):
+    context_data = serialize_batch_context(self.registry.get_context(context))
+    resolution_parts = (resolution.dimensionality, resolution.value) if (resolution is not None) else None
+
+    input_memory, input_array = self._share(magnitudes)
+    length = len(input_array)
+
+    try:
+      futures = [self._executor.submit(format_chunk, input_memory.name, length, start, stop, dimensionality, context_data, resolution_parts, style, system) for start, stop in self._chunks(length)]
+      output = list[str]()
+
+      for future, (start, stop) in zip(futures, self._chunks(length)):
+        if stop > start:
+          output += future.result().split("\0")
+
+      return output
+    finally:
+      del input_array
+      input_memory.close()
+      input_memory.unlink()
+
+  def close(self):
+    self._executor.shutdown()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args: Any):
+    self.close()
+
+
+__all__ = [
+  'ParallelRunner'
+]
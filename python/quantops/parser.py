@@ -2,7 +2,7 @@ import ast
 from decimal import Decimal
 import re
 from abc import ABC
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Literal, Optional, TypeVar
 
 from snaptext import LocatedString, LocationArea
@@ -10,37 +10,58 @@ from snaptext import LocatedString, LocationArea
 from .core import Unit, Dimensionality, InvalidUnitNameError, UnitAssembly, UnitAssemblyConstantPart, UnitAssemblyVariablePart, UnitRegistry
 
 
-REGEXP_SCALAR = re.compile(r"([+-] *)?(?:\d* *\. *\d+|\d+(?: *\.)?)(?:e([+-])?(\d+))?")
+REGEXP_UNSIGNED_SCALAR = re.compile(r"(?:\d* *\. *\d+|\d+(?: *\.)?)(?:e([+-])?(\d+))?")
+REGEXP_SCALAR = re.compile(f"([+-] *)?{REGEXP_UNSIGNED_SCALAR.pattern}")
 REGEXP_PUNCT = re.compile(r"\*\*|\*|/|\(|\)|\^|±|\+-|-|~")
-REGEXP_UNIT = re.compile(r"[a-zA-Z_\u00b5\u03bc]+")
+REGEXP_ARITHMETIC_PUNCT = re.compile(r"\*\*|\*|/|\(|\)|\^|\+|-")
+REGEXP_UNIT = re.compile(r"[a-zA-Z_\u00b0\u00b5\u03bc]+")
+
+# Single-pass tokenizer patterns, the scalar alternative being left out right after a scalar token
+REGEXP_TOKEN = re.compile(f"(?P<scalar>{REGEXP_SCALAR.pattern})|(?P<punct>{REGEXP_PUNCT.pattern})|(?P<space> +)|(?P<unit>{REGEXP_UNIT.pattern})")
+REGEXP_TOKEN_AFTER_SCALAR = re.compile(f"(?P<punct>{REGEXP_PUNCT.pattern})|(?P<space> +)|(?P<unit>{REGEXP_UNIT.pattern})")
+
+# Patterns of the arithmetic mode, where signs are operators rather than part of scalars
+REGEXP_ARITHMETIC_TOKEN = re.compile(f"(?P<scalar>{REGEXP_UNSIGNED_SCALAR.pattern})|(?P<punct>{REGEXP_ARITHMETIC_PUNCT.pattern})|(?P<space> +)|(?P<unit>{REGEXP_UNIT.pattern})")
+REGEXP_ARITHMETIC_TOKEN_AFTER_SCALAR = re.compile(f"(?P<punct>{REGEXP_ARITHMETIC_PUNCT.pattern})|(?P<space> +)|(?P<unit>{REGEXP_UNIT.pattern})")
 
 
 T = TypeVar('T')
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, repr=False)
 class BaseToken(ABC):
-  area: LocationArea
+  source: LocatedString = field(compare=False)
+  span: tuple[int, int]
 
-@dataclass
+  # Areas are only needed for error reporting and are costly to build, so they are derived on demand
+  @property
+  def area(self) -> LocationArea:
+    start, end = self.span
+    return self.source[start:end].area
+
+  def __repr__(self):
+    values = [f"area={self.area!r}"] + [f"{item.name}={getattr(self, item.name)!r}" for item in fields(self) if not item.kw_only]
+    return f"{self.__class__.__name__}({', '.join(values)})"
+
+@dataclass(repr=False)
 class GroupOpenToken(BaseToken):
   pass
 
-@dataclass
+@dataclass(repr=False)
 class GroupCloseToken(BaseToken):
   pass
 
-@dataclass
+@dataclass(repr=False)
 class OpToken(BaseToken):
-  value: Literal['mul', 'div', 'exp', 'rng', 'unc', 'var']
+  value: Literal['add', 'sub', 'mul', 'div', 'exp', 'rng', 'unc', 'var']
 
-@dataclass
+@dataclass(repr=False)
 class ScalarToken(BaseToken):
   value: float | int
 
-@dataclass
+@dataclass(repr=False)
 class UnitToken(BaseToken):
-  value: LocatedString
+  value: str
 
 Token = GroupCloseToken | GroupOpenToken | OpToken | ScalarToken | UnitToken
 
@@ -51,45 +72,76 @@ class ParserError(Exception):
   area: LocationArea
 
 
-def tokenize(input_value: LocatedString, registry: UnitRegistry):
+def parse_scalar(text: str, /) -> float | int:
+  # Shortcut for the common forms, keeping ast.literal_eval() for the others, such as those with
+  # whitespace, leading zeros or non-ASCII digits, for which it is the reference behavior.
+  if text.isascii() and not (' ' in text):
+    if ('.' in text) or ('e' in text):
+      return float(text)
+
+    digits = text.lstrip('+-')
+
+    if (len(digits) < 2) or (digits[0] != '0'):
+      return int(text)
+
+  return ast.literal_eval(text)
+
+
+PUNCT_OPS: dict[str, Literal['mul', 'div', 'exp', 'rng', 'unc', 'var']] = {
+  "*": 'mul',
+  "/": 'div',
+  "**": 'exp',
+  "^": 'exp',
+  "±": 'unc',
+  "+-": 'unc',
+  "-": 'rng',
+  "~": 'var'
+}
+
+ARITHMETIC_PUNCT_OPS: dict[str, Literal['add', 'sub', 'mul', 'div', 'exp']] = {
+  "*": 'mul',
+  "/": 'div',
+  "**": 'exp',
+  "^": 'exp',
+  "+": 'add',
+  "-": 'sub'
+}
+
+def tokenize(input_value: LocatedString, registry: UnitRegistry, *, arithmetic: bool = False):
   cursor = 0
+  length = len(input_value)
   tokens = list[Token]()
+  after_scalar = False
 
-  while cursor < len(input_value):
-    forward_value = input_value[cursor:]
-
-    if ((not tokens) or not isinstance(tokens[-1], ScalarToken)) and (match := forward_value.match_re(REGEXP_SCALAR)):
-      cursor += match.span()[1]
-
-      value = ast.literal_eval(match.group())
-      tokens.append(ScalarToken(value, area=match.area))
-    elif (match := forward_value.match_re(REGEXP_PUNCT)):
-      cursor += match.span()[1]
-
-      match match.group():
-        case "*":
-          tokens.append(OpToken('mul', area=match.area))
-        case "/":
-          tokens.append(OpToken('div', area=match.area))
-        case "**" | "^":
-          tokens.append(OpToken('exp', area=match.area))
-        case "±" | "+-":
-          tokens.append(OpToken('unc', area=match.area))
-        case "-":
-          tokens.append(OpToken('rng', area=match.area))
-        case "~":
-          tokens.append(OpToken('var', area=match.area))
-        case "(":
-          tokens.append(GroupOpenToken(area=match.area))
-        case ")":
-          tokens.append(GroupCloseToken(area=match.area))
-    elif (match := re.match(" +", forward_value)):
-      cursor += match.span()[1]
-    elif (match := forward_value.match_re(REGEXP_UNIT)):
-      cursor += match.span()[1]
-      tokens.append(UnitToken(match.group(), area=match.area))
-    else:
-      raise ParserError("Invalid value", forward_value[0].area)
+  pattern, pattern_after_scalar = (REGEXP_ARITHMETIC_TOKEN, REGEXP_ARITHMETIC_TOKEN_AFTER_SCALAR) if arithmetic else (REGEXP_TOKEN, REGEXP_TOKEN_AFTER_SCALAR)
+  punct_ops = ARITHMETIC_PUNCT_OPS if arithmetic else PUNCT_OPS
+
+  while cursor < length:
+    match = (pattern_after_scalar if after_scalar else pattern).match(input_value, cursor)
+
+    if not match:
+      raise ParserError("Invalid value", input_value[cursor:(cursor + 1)].area)
+
+    span = match.span()
+    text = match.group()
+    cursor = span[1]
+
+    match match.lastgroup:
+      case 'scalar':
+        tokens.append(ScalarToken(parse_scalar(text), source=input_value, span=span))
+      case 'punct':
+        if text == "(":
+          tokens.append(GroupOpenToken(source=input_value, span=span))
+        elif text == ")":
+          tokens.append(GroupCloseToken(source=input_value, span=span))
+        else:
+          tokens.append(OpToken(punct_ops[text], source=input_value, span=span))
+      case 'space':
+        continue
+      case _:
+        tokens.append(UnitToken(text, source=input_value, span=span))
+
+    after_scalar = (match.lastgroup == 'scalar')
 
   return TokenWalker(registry, input_value, tokens)
 
@@ -155,7 +207,7 @@ class TokenWalker:
             break
 
       match self.peek():
-        case UnitToken(value):
+        case UnitToken(value) as unit_token:
           self.inc()
           unit_name = value
         case _ if started:
@@ -165,10 +217,10 @@ class TokenWalker:
 
       power *= self.accept_assembly_power()
 
-      if (group := self.registry._unit_groups.get(unit_name)) and variable:
+      if variable and (group := self.registry._find_unit_group(unit_name)):
         variable_part = UnitAssemblyVariablePart(frozenset(group), Decimal(power))
         dimensionality *= next(iter(group)).dimensionality ** Decimal(power)
-      elif (unit := self.registry._units_by_name.get(unit_name)):
+      elif (unit := self.registry._find_unit(unit_name)):
         if variable:
           variable_part = UnitAssemblyVariablePart(frozenset({unit}), Decimal(power))
         else:
@@ -176,14 +228,14 @@ class TokenWalker:
 
         dimensionality *= unit.dimensionality ** Decimal(power)
       else:
-        raise ParserError("Invalid name", value.area)
+        raise ParserError("Invalid name", unit_token.area)
 
     if not (before_variable_parts or variable_part or after_variable_parts):
       return None
 
     return UnitAssembly(
-      after_variable_parts,
-      before_variable_parts,
+      tuple(after_variable_parts),
+      tuple(before_variable_parts),
       variable_part
     ), dimensionality
 
@@ -199,15 +251,15 @@ class TokenWalker:
           return None
 
     match self.peek():
-      case UnitToken(value):
+      case UnitToken(value) as token:
         self.inc()
 
-        if (group := self.registry._unit_groups.get(value)) and variable:
+        if variable and (group := self.registry._find_unit_group(value)):
           return True, frozenset(group)
-        elif (unit := self.registry._units_by_name.get(value)):
+        elif (unit := self.registry._find_unit(value)):
           return (True, frozenset({unit})) if variable else (False, unit)
         else:
-          raise ParserError("Invalid name", value.area)
+          raise ParserError("Invalid name", token.area)
       case _ if variable:
         raise ParserError("Invalid token, expected unit", self.peek_area())
       case _:
@@ -228,13 +280,13 @@ class TokenWalker:
 
   def accept_base_unit(self):
     match self.peek():
-      case UnitToken(value):
+      case UnitToken(value) as token:
         self.inc()
 
         try:
           unit = self.registry.unit(value)
         except InvalidUnitNameError:
-          raise ParserError(f"Invalid unit '{value}'", value.area)
+          raise ParserError(f"Invalid unit '{value}'", token.area)
 
         return unit
       case _:
@@ -305,6 +357,164 @@ class TokenWalker:
 
     return scalar * unit
 
+  def accept_expression(self, variables: dict[str, tuple[int, Dimensionality]], /):
+    from .expression import create_sum
+
+    node = self.accept_expression_product(variables)
+
+    if node is None:
+      return None
+
+    while True:
+      match self.peek():
+        case OpToken('add' | 'sub') as token:
+          self.inc()
+          other_node = self.accept_expression_product(variables)
+
+          if other_node is None:
+            raise ParserError("Invalid token, expected operand", self.peek_area())
+
+          if other_node.dimensionality is not node.dimensionality:
+            raise ParserError("Dimensionality mismatch", token.area)
+
+          node = create_sum(node, other_node, subtract=(token.value == 'sub'))
+        case _:
+          return node
+
+  def accept_expression_product(self, variables: dict[str, tuple[int, Dimensionality]], /):
+    from .expression import create_product
+
+    node = self.accept_expression_juxtaposition(variables)
+
+    if node is None:
+      return None
+
+    while True:
+      match self.peek():
+        case OpToken('mul' | 'div') as token:
+          self.inc()
+          other_node = self.accept_expression_juxtaposition(variables)
+
+          if other_node is None:
+            raise ParserError("Invalid token, expected operand", self.peek_area())
+
+          node = create_product(node, other_node, self.registry, divide=(token.value == 'div'))
+        case _:
+          return node
+
+  def accept_expression_juxtaposition(self, variables: dict[str, tuple[int, Dimensionality]], /):
+    from .expression import create_product
+
+    # Juxtaposed operands, as in '3 ml', bind tighter than explicit operators
+    node = self.accept_expression_power(variables)
+
+    if node is None:
+      return None
+
+    while isinstance(self.peek(), (GroupOpenToken, ScalarToken, UnitToken)):
+      other_node = self.accept_expression_power(variables)
+      assert other_node is not None
+
+      node = create_product(node, other_node, self.registry)
+
+    return node
+
+  def accept_expression_power(self, variables: dict[str, tuple[int, Dimensionality]], /):
+    from .expression import ConstantNode, create_power, create_product
+
+    match self.peek():
+      case OpToken('sub'):
+        self.inc()
+
+        if (node := self.accept_expression_reading(variables, negative=True)) is not None:
+          return node
+
+        node = self.accept_expression_power(variables)
+
+        if node is None:
+          raise ParserError("Invalid token, expected operand", self.peek_area())
+
+        return create_product(ConstantNode(Dimensionality(), self.registry._numeric.convert(-1)), node, self.registry)
+
+    if (node := self.accept_expression_reading(variables)) is not None:
+      return node
+
+    node = self.accept_expression_operand(variables)
+
+    if node is None:
+      return None
+
+    match self.peek():
+      case OpToken('exp'):
+        self.inc()
+        negative = isinstance(self.peek(), OpToken) and (self.peek().value == 'sub') # type: ignore
+
+        if negative:
+          self.inc()
+
+        exp = self.accept_scalar()
+
+        if exp is None:
+          raise ParserError("Invalid token, expected scalar", self.peek_area())
+
+        return create_power(node, -exp if negative else exp, self.registry)
+      case _:
+        return node
+
+  def accept_expression_reading(self, variables: dict[str, tuple[int, Dimensionality]], /, *, negative: bool = False):
+    from .expression import ConstantNode
+
+    # Scalars followed by a unit with an offset, as in '20 degC', are readings in that unit and include
+    # its offset, as do numbers bound to variables of that unit
+    match self.tokens[self.cursor:(self.cursor + 3)]:
+      case [ScalarToken(), UnitToken(), OpToken('exp')]:
+        return None
+      case [ScalarToken(value), UnitToken(name), *_] if name not in variables:
+        unit = self.registry._find_unit(name)
+
+        if (unit is None) or not unit.offset:
+          return None
+
+        self.cursor += 2
+        scalar = self.registry._numeric.convert(value)
+
+        return ConstantNode(unit.dimensionality, (-scalar if negative else scalar) * unit.value + unit.offset)
+      case _:
+        return None
+
+  def accept_expression_operand(self, variables: dict[str, tuple[int, Dimensionality]], /):
+    from .expression import ConstantNode, VariableNode
+
+    match self.peek():
+      case ScalarToken(value):
+        self.inc()
+        return ConstantNode(Dimensionality(), self.registry._numeric.convert(value))
+      case UnitToken(value) as token:
+        self.inc()
+
+        if value in variables:
+          index, dimensionality = variables[value]
+          return VariableNode(dimensionality, index)
+
+        if (unit := self.registry._find_unit(value)) is None:
+          raise ParserError("Invalid name", token.area)
+
+        return ConstantNode(unit.dimensionality, unit.value)
+      case GroupOpenToken() as token:
+        self.inc()
+        node = self.accept_expression(variables)
+
+        if node is None:
+          raise ParserError("Invalid token, expected operand", self.peek_area())
+
+        if not isinstance(self.peek(), GroupCloseToken):
+          raise ParserError("Unexpected EOF, expected matching closing parenthesis", token.area)
+
+        self.inc()
+        return node
+      case _:
+        return None
+
   def accept_measurement(self):
     quantity = self.accept_quantity()
 
@@ -0,0 +1,198 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from .core import AtomicUnit, UnitRegistry, get_coherent_dimension
+from .numeric import Number
+
+
+@dataclass(frozen=True, slots=True)
+class Prefix:
+  factor: Number
+  label: str
+  symbol: str
+  symbol_names: tuple[str, ...]
+
+@dataclass(frozen=True, slots=True)
+class PrefixSystem:
+  extend: tuple[str, ...]
+  name: str
+  prefixes: tuple[Prefix, ...]
+
+def create_prefixed_unit(unit: AtomicUnit, prefix: Prefix, /):
+  assert unit.symbol is not None
+
+  return AtomicUnit(
+    dimensionality=unit.dimensionality,
+    offset=unit.offset,
+    label=(sys.intern(prefix.label + unit.label[0]), sys.intern(prefix.label + unit.label[1])),
+    registry=unit.registry,
+    symbol=(sys.intern(prefix.symbol + unit.symbol[0]), sys.intern(prefix.symbol + unit.symbol[1])),
+    value=(prefix.factor * unit.value)
+  )
+
+def register_unit(registry: UnitRegistry, unit: AtomicUnit, names: Sequence[str], /):
+  registry._units_by_id[unit.id] = unit
+
+  for name in names:
+    registry._units_by_name[name] = unit
+
+def get_prefixed_names(prefix: Prefix, label_names: Sequence[str], symbol_names: Sequence[str], /):
+  return [
+    *(sys.intern(prefix.label + name) for name in label_names),
+    *(sys.intern(prefix_name + symbol_name) for symbol_name in symbol_names for prefix_name in prefix.symbol_names)
+  ]
+
+
+# A unit of the registry file along with the prefixes it accepts, in the order in which they are
+# expanded by the eager loader, with later ones taking precedence over earlier ones
+@dataclass(slots=True)
+class UnitFamily:
+  index: int
+  unit: AtomicUnit
+  label_names: tuple[str, ...]
+  symbol_names: tuple[str, ...]
+  prefixes: tuple[Prefix, ...]
+
+  label_prefixes: dict[str, int] = field(default_factory=dict, init=False)
+  symbol_prefixes: dict[str, int] = field(default_factory=dict, init=False)
+  units: dict[int, AtomicUnit] = field(default_factory=dict, init=False)
+
+  def __post_init__(self):
+    for position, prefix in enumerate(self.prefixes):
+      self.label_prefixes[prefix.label] = position
+
+      for prefix_name in prefix.symbol_names:
+        self.symbol_prefixes[prefix_name] = position
+
+  def materialize(self, position: int, /):
+    unit = self.units.get(position)
+
+    if unit is None:
+      unit = create_prefixed_unit(self.unit, self.prefixes[position])
+      self.units[position] = unit
+
+    return unit
+
+  def materialize_all(self):
+    return [self.materialize(position) for position in range(len(self.prefixes))]
+
+
+# Resolves prefixed unit names on demand, walking a trie of prefix names and looking up the
+# remainder of the name among the names of units accepting that prefix
+class PrefixIndex:
+  def __init__(self, registry: UnitRegistry, /):
+    self.families = list[UnitFamily]()
+    self.initial_units_by_id = dict(registry._units_by_id)
+    self.initial_units_by_name = dict(registry._units_by_name)
+    self.pending_groups = dict[str, list[UnitFamily]]()
+
+    self._base_names = dict[str, list[tuple[UnitFamily, bool]]]()
+    self._direct_names = { name: -1 for name in registry._units_by_name }
+    self._trie = dict[str, Any]()
+
+  def add(self, family: UnitFamily, /):
+    self.families.append(family)
+
+    for name in (*family.label_names, *family.symbol_names):
+      self._direct_names[name] = family.index
+
+    if not family.prefixes:
+      return
+
+    for name in family.label_names:
+      self._base_names.setdefault(name, list()).append((family, False))
+
+    for name in family.symbol_names:
+      self._base_names.setdefault(name, list()).append((family, True))
+
+    for prefix_name in (*family.label_prefixes, *family.symbol_prefixes):
+      node = self._trie
+
+      for char in prefix_name:
+        node = node.setdefault(char, dict())
+
+      node[""] = True
+
+  # Called before adding a family when extending a loaded registry, returning which of its prefixed
+  # names are already known, with those registered directly being resolved again by finish()
+  def shadow(self, registry: UnitRegistry, names: Sequence[str], /):
+    replaced_names = { name for name in names if (name in registry._units_by_name) or (self._resolve(name) is not None) }
+
+    for name in replaced_names:
+      if name in registry._units_by_name:
+        self._direct_names.setdefault(name, -1)
+
+    return replaced_names
+
+  def find(self, name: str, /):
+    result = self._resolve(name)
+    return result[0].materialize(result[1]) if result else None
+
+  def finish(self, registry: UnitRegistry, /):
+    # Names of unprefixed units are registered directly, but may be shadowed by prefixed names of
+    # units that come later in the registry file
+    for name, index in self._direct_names.items():
+      if (result := self._resolve(name)) and (result[0].index >= index):
+        registry._units_by_name[name] = result[0].materialize(result[1])
+
+    self._direct_names.clear()
+
+  def coherent_units(self):
+    # Candidates for base units, in the order in which the eager loader registers them, only
+    # materializing the prefixed units whose value is one
+    yield from self.initial_units_by_name.values()
+
+    for family in self.families:
+      unit = family.unit
+      yield unit
+
+      for position, prefix in enumerate(family.prefixes):
+        if get_coherent_dimension(unit.dimensionality, unit.offset, prefix.factor * unit.value) is not None:
+          yield family.materialize(position)
+
+  def expand_group(self, name: str, group: set[AtomicUnit], /):
+    for family in self.pending_groups.pop(name, list()):
+      group.update(family.materialize_all())
+
+  def materialize(self, registry: UnitRegistry, /):
+    registry._units_by_id = dict(self.initial_units_by_id)
+    registry._units_by_name = dict(self.initial_units_by_name)
+
+    for family in self.families:
+      register_unit(registry, family.unit, (*family.label_names, *family.symbol_names))
+
+      for position, prefix in enumerate(family.prefixes):
+        register_unit(registry, family.materialize(position), get_prefixed_names(prefix, family.label_names, family.symbol_names))
+
+    for name in list(self.pending_groups):
+      self.expand_group(name, registry._unit_groups[name])
+
+  def _resolve(self, name: str, /) -> Optional[tuple[UnitFamily, int]]:
+    node = self._trie
+    result: Optional[tuple[UnitFamily, int]] = None
+
+    for length, char in enumerate(name, start=1):
+      node = node.get(char)
+
+      if node is None:
+        break
+
+      if "" in node:
+        prefix_name = name[:length]
+
+        for family, symbol in self._base_names.get(name[length:], list()):
+          position = (family.symbol_prefixes if symbol else family.label_prefixes).get(prefix_name)
+
+          if (position is not None) and ((result is None) or ((family.index, position) > (result[0].index, result[1]))):
+            result = family, position
+
+    return result
+
+
+__all__ = [
+  'Prefix',
+  'PrefixIndex',
+  'PrefixSystem',
+  'UnitFamily'
+]
@@ -0,0 +1,597 @@
+import functools
+import itertools
+import json
+import operator
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import (IO, Any, Callable, Iterable, Iterator, Literal, Optional,
+                    Sequence, TypeVar)
+
+from .core import (AtomicUnit, Context, ContextName, ContextVariant,
+                   ContextVariantOption, Dimensionality, DimensionName,
+                   Quantity, SystemName, UnitAssemblyConstantPart, UnitId,
+                   UnitRegistry)
+from .numeric import NUMERIC_BACKENDS, Number
+
+
+FORMAT_VERSION = 1
+
+QUANTITIES_MAGIC = b"QOQB"
+REGISTRY_MAGIC = b"QORB"
+
+ArrayTypecode = Literal['H', 'I', 'd']
+MagnitudeFormat = Literal['decimal', 'float64']
+MAGNITUDE_FORMATS: list[MagnitudeFormat] = ['float64', 'decimal']
+
+# Magic, format version, magnitude format, quantity count, string count, dimensionality count
+QUANTITIES_HEADER = struct.Struct("<4sBBxxIII")
+
+# Magic, format version, numeric backend, string count, unit count, context count
+REGISTRY_HEADER = struct.Struct("<4sBBxxIII")
+
+NATIVE_LITTLE_ENDIAN = (sys.byteorder == 'little')
+
+T = TypeVar('T')
+
+
+## JSON
+
+def encode_number(value: Number, /) -> float | int | str:
+  match value:
+    case float() | int():
+      return value
+    case _:
+      return str(value)
+
+def decode_number(registry: UnitRegistry, value: float | int | str, /):
+  try:
+    match value:
+      case str():
+        return registry._numeric.convert(Fraction(value)) if ("/" in value) else registry._numeric.parse(value)
+      case float():
+        # Parsed from the shortest representation which round-trips, as done by to_decimal()
+        return registry._numeric.parse(repr(value))
+      case _:
+        return registry._numeric.convert(value)
+  except (ArithmeticError, ValueError) as e:
+    raise ValueError(f"Invalid number: {value!r}") from e
+
+def encode_power(power: Decimal, /):
+  return int(power) if (power == power.to_integral_value()) else str(power)
+
+def json_default(value: Any, /):
+  # For json.dump(), emitting registry values as numbers as expected by the JavaScript package
+  if isinstance(value, (Decimal, Fraction)):
+    return float(value)
+
+  raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def serialize_quantity(quantity: Quantity, /):
+  return {
+    "dimensionality": { dimension: encode_power(power) for dimension, power in quantity.dimensionality.items() },
+    "value": encode_number(quantity.value)
+  }
+
+def deserialize_quantity(registry: UnitRegistry, data: dict[str, Any], /):
+  return Quantity(
+    dimensionality=Dimensionality({ DimensionName(dimension): Decimal(power) for dimension, power in data["dimensionality"].items() }),
+    registry=registry,
+    value=decode_number(registry, data["value"])
+  )
+
+
+## Binary
+
+class BinaryWriter:
+  def __init__(self):
+    self.body = bytearray()
+    self.strings = dict[str, int]()
+
+  def align(self, offset: int, /):
+    # Pads the body so that it ends on a multiple of 8 bytes once preceded by the given offset
+    self.body += bytes(-(offset + len(self.body)) % 8)
+
+  def intern(self, value: str, /):
+    return self.strings.setdefault(value, len(self.strings))
+
+  def pack(self, format: str, /, *values: Any):
+    self.body += struct.pack(format, *values)
+
+  def encode_strings(self):
+    output = bytearray()
+
+    for value in self.strings:
+      encoded = value.encode()
+      output += struct.pack("<I", len(encoded))
+      output += encoded
+
+    return output
+
+class BinaryReader:
+  def __init__(self, data: bytes | memoryview, offset: int = 0, /):
+    self.data = memoryview(data).cast('B')
+    self.offset = offset
+    self.strings = list[str]()
+
+  def align(self):
+    self.offset += -self.offset % 8
+
+  def read(self, size: int, /):
+    if self.offset + size > len(self.data):
+      raise ValueError("Truncated data")
+
+    view = self.data[self.offset:(self.offset + size)]
+    self.offset += size
+
+    return view
+
+  def unpack(self, format: str, /):
+    return struct.unpack(format, self.read(struct.calcsize(format)))
+
+  def decode_strings(self, count: int, /):
+    for _ in range(count):
+      length, = self.unpack("<I")
+      self.strings.append(decode_utf8(self.read(length)))
+
+  def string(self):
+    index, = self.unpack("<I")
+
+    if index >= len(self.strings):
+      raise ValueError("Invalid data")
+
+    return self.strings[index]
+
+  def number(self, parse: Callable[[str], T], /) -> T:
+    try:
+      return parse(self.string())
+    except (InvalidOperation, ValueError) as e:
+      raise ValueError("Invalid data") from e
+
+
+def decode_utf8(data: bytes | memoryview, /):
+  try:
+    return str(data, "utf-8")
+  except UnicodeDecodeError as e:
+    raise ValueError("Invalid data") from e
+
+def read_array(reader: BinaryReader, typecode: ArrayTypecode, count: int, /) -> Sequence[Any]:
+  view = reader.read(count * array(typecode).itemsize)
+
+  # Little-endian data is viewed in place, and only copied on big-endian platforms
+  if NATIVE_LITTLE_ENDIAN:
+    return view.cast(typecode)
+
+  output = array(typecode, view)
+  output.byteswap()
+  return output
+
+def write_array(writer: BinaryWriter, typecode: ArrayTypecode, values: Any, /):
+  output = array(typecode, values)
+
+  if not NATIVE_LITTLE_ENDIAN:
+    output.byteswap()
+
+  writer.body += output.tobytes()
+
+
+def encode_quantities(quantities: Sequence[Quantity], /, *, magnitude_format: MagnitudeFormat = 'float64'):
+  writer = BinaryWriter()
+  codes_by_dimensionality = dict[Dimensionality, int]()
+  codes = [codes_by_dimensionality.setdefault(quantity.dimensionality, len(codes_by_dimensionality)) for quantity in quantities]
+
+  # Codes are stored as unsigned 16-bit integers
+  if len(codes_by_dimensionality) > 0x10000:
+    raise ValueError("Too many distinct dimensionalities")
+
+  for dimensionality in codes_by_dimensionality:
+    writer.pack("<I", len(dimensionality))
+
+    for dimension, power in dimensionality.items():
+      writer.pack("<II", writer.intern(dimension), writer.intern(str(power)))
+
+  strings = writer.encode_strings()
+  offset = QUANTITIES_HEADER.size + len(strings)
+
+  writer.align(offset)
+  write_array(writer, 'H', codes)
+  writer.align(offset)
+
+  match magnitude_format:
+    case 'float64':
+      write_array(writer, 'd', [float(quantity.value) for quantity in quantities])
+    case 'decimal':
+      encoded_values = [str(quantity.value).encode() for quantity in quantities]
+      ends = array('I', [0]) * len(encoded_values)
+      end = 0
+
+      for index, encoded_value in enumerate(encoded_values):
+        end += len(encoded_value)
+        ends[index] = end
+
+      write_array(writer, 'I', ends)
+      writer.body += b"".join(encoded_values)
+
+  header = QUANTITIES_HEADER.pack(
+    QUANTITIES_MAGIC,
+    FORMAT_VERSION,
+    MAGNITUDE_FORMATS.index(magnitude_format),
+    len(quantities),
+    len(writer.strings),
+    len(codes_by_dimensionality)
+  )
+
+  return header + strings + writer.body
+
+
+@dataclass(frozen=True, slots=True)
+class QuantityBatch:
+  codes: Sequence[int]
+  dimensionalities: list[Dimensionality]
+  magnitude_format: MagnitudeFormat
+  registry: UnitRegistry
+
+  # Views on the decoded data, either float64 magnitudes or the end offsets and bytes of decimal strings
+  _magnitudes: Sequence[float]
+  _decimal_ends: Sequence[int]
+  _decimal_data: Optional[memoryview]
+
+  @property
+  def magnitudes(self):
+    if self.magnitude_format != 'float64':
+      raise ValueError("Magnitudes are not stored as float64")
+
+    return self._magnitudes
+
+  def magnitude(self, index: int, /) -> Number:
+    if self._decimal_data is not None:
+      start = self._decimal_ends[index - 1] if index > 0 else 0
+      return decode_number(self.registry, decode_utf8(self._decimal_data[start:self._decimal_ends[index]]))
+
+    return self.registry._numeric.convert(self._magnitudes[index])
+
+  def __getitem__(self, index: int, /):
+    if index < 0:
+      index += len(self)
+
+    if not (0 <= index < len(self)):
+      raise IndexError("Index out of range")
+
+    return Quantity(
+      dimensionality=self.dimensionalities[self.codes[index]],
+      registry=self.registry,
+      value=self.magnitude(index)
+    )
+
+  def __iter__(self) -> Iterator[Quantity]:
+    for index in range(len(self)):
+      yield self[index]
+
+  def __len__(self):
+    return len(self.codes)
+
+
+def decode_quantities(registry: UnitRegistry, data: bytes | memoryview, /):
+  reader = BinaryReader(data)
+
+  if len(reader.data) < QUANTITIES_HEADER.size:
+    raise ValueError("Truncated data")
+
+  magic, version, magnitude_format_index, count, string_count, dimensionality_count = reader.unpack(QUANTITIES_HEADER.format)
+
+  if (magic != QUANTITIES_MAGIC) or (magnitude_format_index >= len(MAGNITUDE_FORMATS)):
+    raise ValueError("Invalid data")
+
+  if version != FORMAT_VERSION:
+    raise ValueError(f"Unsupported format version: {version}")
+
+  magnitude_format = MAGNITUDE_FORMATS[magnitude_format_index]
+  reader.decode_strings(string_count)
+
+  dimensionalities = list[Dimensionality]()
+
+  for _ in range(dimensionality_count):
+    dimension_count, = reader.unpack("<I")
+    dimensionalities.append(Dimensionality({ DimensionName(reader.string()): reader.number(Decimal) for _ in range(dimension_count) }))
+
+  reader.align()
+  codes = read_array(reader, 'H', count)
+  reader.align()
+
+  if (count > 0) and (max(codes) >= dimensionality_count):
+    raise ValueError("Invalid data")
+
+  if magnitude_format == 'float64':
+    return QuantityBatch(codes, dimensionalities, magnitude_format, registry, read_array(reader, 'd', count), list(), None)
+
+  decimal_ends = read_array(reader, 'I', count)
+
+  if any(start > end for start, end in itertools.pairwise(decimal_ends)):
+    raise ValueError("Invalid data")
+
+  decimal_data = reader.read(decimal_ends[-1] if count > 0 else 0)
+
+  return QuantityBatch(codes, dimensionalities, magnitude_format, registry, list(), decimal_ends, decimal_data)
+
+
+def encode_registry(registry: UnitRegistry, /):
+  data = registry.serialize()
+  writer = BinaryWriter()
+
+  for unit_id, unit_data in data["units"].items():
+    symbol = unit_data["symbol"]
+
+    writer.pack("<III", writer.intern(unit_id), *(writer.intern(label) for label in unit_data["label"]))
+    writer.pack("<B", symbol is not None)
+
+    if symbol is not None:
+      writer.pack("<II", *(writer.intern(item) for item in symbol))
+
+    writer.pack("<II", writer.intern(str(unit_data["offset"])), writer.intern(str(unit_data["value"])))
+
+  for context_name, context_data in data["contexts"].items():
+    writer.pack("<II", writer.intern(context_name), len(context_data["variants"]))
+
+    for variant_data in context_data["variants"]:
+      writer.pack("<I", len(variant_data["systems"]))
+      writer.pack(f"<{len(variant_data['systems'])}I", *(writer.intern(system) for system in variant_data["systems"]))
+      writer.pack("<I", len(variant_data["options"]))
+
+      for option_data in variant_data["options"]:
+        writer.pack("<II", writer.intern(str(option_data["value"])), len(option_data["assembly"]))
+
+        for unit_id, power in option_data["assembly"]:
+          writer.pack("<II", writer.intern(unit_id), writer.intern(str(power)))
+
+  header = REGISTRY_HEADER.pack(
+    REGISTRY_MAGIC,
+    FORMAT_VERSION,
+    list(NUMERIC_BACKENDS).index(registry._numeric.name),
+    len(writer.strings),
+    len(data["units"]),
+    len(data["contexts"])
+  )
+
+  return header + writer.encode_strings() + writer.body
+
+def decode_registry(data: bytes | memoryview, /):
+  reader = BinaryReader(data)
+
+  if len(reader.data) < REGISTRY_HEADER.size:
+    raise ValueError("Truncated data")
+
+  magic, version, numeric_index, string_count, unit_count, context_count = reader.unpack(REGISTRY_HEADER.format)
+
+  if (magic != REGISTRY_MAGIC) or (numeric_index >= len(NUMERIC_BACKENDS)):
+    raise ValueError("Invalid data")
+
+  if version != FORMAT_VERSION:
+    raise ValueError(f"Unsupported format version: {version}")
+
+  parse = list(NUMERIC_BACKENDS.values())[numeric_index].parse
+  reader.decode_strings(string_count)
+
+  units = dict[str, Any]()
+  contexts = dict[str, Any]()
+
+  for _ in range(unit_count):
+    unit_id = reader.string()
+    label = [reader.string(), reader.string()]
+    has_symbol, = reader.unpack("<B")
+    symbol = [reader.string(), reader.string()] if has_symbol else None
+
+    units[unit_id] = {
+      "label": label,
+      "offset": reader.number(parse),
+      "symbol": symbol,
+      "value": reader.number(parse)
+    }
+
+  for _ in range(context_count):
+    context_name = reader.string()
+    variant_count, = reader.unpack("<I")
+    variants = list[dict[str, Any]]()
+
+    for _ in range(variant_count):
+      system_count, = reader.unpack("<I")
+      systems = [reader.string() for _ in range(system_count)]
+      option_count, = reader.unpack("<I")
+      options = list[dict[str, Any]]()
+
+      for _ in range(option_count):
+        value = reader.number(parse)
+        part_count, = reader.unpack("<I")
+
+        options.append({
+          "assembly": [[reader.string(), reader.number(Decimal)] for _ in range(part_count)],
+          "value": value
+        })
+
+      variants.append({ "options": options, "systems": systems })
+
+    contexts[context_name] = { "variants": variants }
+
+  return {
+    "contexts": contexts,
+    "units": units
+  }
+
+
+## Batches
+
+BatchItem = Quantity | tuple[Quantity, Optional[Context | ContextName | str]]
+
+def find_unit_by_id(registry: UnitRegistry, unit_id: str, /) -> AtomicUnit:
+  if (unit := registry._units_by_id.get(UnitId(unit_id))) is None:
+    registry._materialize_all()
+    unit = registry._units_by_id[UnitId(unit_id)]
+
+  return unit
+
+def deserialize_context(registry: UnitRegistry, data: dict[str, Any], /):
+  if data["type"] == "known":
+    return registry.get_context(data["name"])
+
+  variants = [ContextVariant(
+    tuple(ContextVariantOption(
+      tuple(UnitAssemblyConstantPart(find_unit_by_id(registry, unit_id), Decimal(power)) for unit_id, power in option_data["assembly"]),
+      decode_number(registry, option_data["value"])
+    ) for option_data in variant_data["options"]),
+    systems={ SystemName(system_name) for system_name in variant_data["systems"] }
+  ) for variant_data in data["value"]["variants"]]
+
+  dimensionality = functools.reduce(
+    operator.mul,
+    [part.unit.dimensionality ** part.power for part in variants[0].options[0].assembly],
+    Dimensionality()
+  )
+
+  return Context(dimensionality, variants)
+
+# Anonymous contexts are serialized with exact values, unlike Context.serialize_external() whose values
+# are emitted as JSON numbers
+def serialize_batch_context(context: Context, /):
+  if context.name:
+    return context.serialize_external()
+
+  return {
+    "type": "anonymous",
+    "value": {
+      "variants": [
+        {
+          "options": [
+            {
+              "assembly": [[part.unit.id, encode_power(part.power)] for part in option.assembly],
+              "value": encode_number(option.value)
+            } for option in variant.options
+          ],
+          "systems": [system_name for system_name in variant.systems]
+        } for variant in context.variants
+      ]
+    }
+  }
+
+
+# Encodes batches of quantities into columns of dimensionality codes, context codes and magnitudes,
+# preceded by the contexts and dimensionalities not already emitted in previous batches
+class BatchEncoder:
+  def __init__(self, *, magnitude_format: MagnitudeFormat = 'float64'):
+    self.magnitude_format = magnitude_format
+
+    self._context_codes = dict[Any, int]()
+    self._dimensionality_codes = dict[Dimensionality, int]()
+
+    # Anonymous contexts are identified by their id(), and are therefore kept alive
+    self._contexts = list[Context]()
+
+  def encode(self, items: Iterable[BatchItem], /):
+    contexts = list[Any]()
+    dimensionalities = list[Any]()
+
+    context_column = list[Optional[int]]()
+    dimensionality_column = list[int]()
+    value_column = list[float | int | str]()
+
+    encode_value = float if (self.magnitude_format == 'float64') else str
+
+    for item in items:
+      quantity, context = item if isinstance(item, tuple) else (item, None)
+
+      if context is None:
+        context_column.append(None)
+      else:
+        if not isinstance(context, Context):
+          context = quantity.registry._contexts[ContextName(context)]
+
+        key = context.name or id(context)
+
+        if (context_code := self._context_codes.get(key)) is None:
+          context_code = self._context_codes[key] = len(self._contexts)
+          contexts.append(serialize_batch_context(context))
+          self._contexts.append(context)
+
+        context_column.append(context_code)
+
+      if (dimensionality_code := self._dimensionality_codes.get(quantity.dimensionality)) is None:
+        dimensionality_code = self._dimensionality_codes[quantity.dimensionality] = len(self._dimensionality_codes)
+        dimensionalities.append({ dimension: encode_power(power) for dimension, power in quantity.dimensionality.items() })
+
+      dimensionality_column.append(dimensionality_code)
+      value_column.append(encode_value(quantity.value))
+
+    return {
+      "contexts": contexts,
+      "dimensionalities": dimensionalities,
+      "items": {
+        "context": context_column,
+        "dimensionality": dimensionality_column,
+        "value": value_column
+      }
+    }
+
+class BatchDecoder:
+  def __init__(self, registry: UnitRegistry, /):
+    self.contexts = list[Context]()
+    self.dimensionalities = list[Dimensionality]()
+    self.registry = registry
+
+  def decode(self, data: dict[str, Any], /):
+    for context_data in data["contexts"]:
+      self.contexts.append(deserialize_context(self.registry, context_data))
+
+    for dimensionality_data in data["dimensionalities"]:
+      self.dimensionalities.append(Dimensionality({ DimensionName(dimension): Decimal(power) for dimension, power in dimensionality_data.items() }))
+
+    items = data["items"]
+
+    return [(
+      Quantity(
+        dimensionality=self.dimensionalities[dimensionality_code],
+        registry=self.registry,
+        value=decode_number(self.registry, value)
+      ),
+      self.contexts[context_code] if (context_code is not None) else None
+    ) for context_code, dimensionality_code, value in zip(items["context"], items["dimensionality"], items["value"])]
+
+
+def serialize_batch(items: Iterable[BatchItem], /, *, magnitude_format: MagnitudeFormat = 'float64'):
+  return BatchEncoder(magnitude_format=magnitude_format).encode(items)
+
+def deserialize_batch(registry: UnitRegistry, data: dict[str, Any], /):
+  return BatchDecoder(registry).decode(data)
+
+def write_batch(file: IO[str], items: Iterable[BatchItem], /, *, chunk_size: int = 10000, magnitude_format: MagnitudeFormat = 'float64'):
+  # Writes one JSON document per line, each holding at most chunk_size items
+  encoder = BatchEncoder(magnitude_format=magnitude_format)
+  iterator = iter(items)
+
+  while (chunk := list(itertools.islice(iterator, chunk_size))):
+    json.dump(encoder.encode(chunk), file, default=json_default, separators=(',', ':'))
+    file.write("\n")
+
+def read_batch(registry: UnitRegistry, file: IO[str], /) -> Iterator[tuple[Quantity, Optional[Context]]]:
+  decoder = BatchDecoder(registry)
+
+  for line in file:
+    if line.strip():
+      yield from decoder.decode(json.loads(line))
+
+
+__all__ = [
+  'BatchDecoder',
+  'BatchEncoder',
+  'QuantityBatch',
+  'decode_quantities',
+  'decode_registry',
+  'deserialize_batch',
+  'encode_quantities',
+  'encode_registry',
+  'json_default',
+  'read_batch',
+  'serialize_batch',
+  'write_batch'
+]
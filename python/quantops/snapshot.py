@@ -0,0 +1,239 @@
+import functools
+import hashlib
+import io
+import os
+import pickle
+import sys
+import weakref
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from .core import UnitRegistry
+from .numeric import NumericBackendName
+
+
+# To be incremented whenever the layout of the registry's internal state changes
+SNAPSHOT_VERSION = 5
+
+# Registries of this process by fingerprint and by id(), through which registries pickled by reference
+# are resolved
+registries_by_fingerprint = weakref.WeakValueDictionary[str, UnitRegistry]()
+registries_by_id = weakref.WeakValueDictionary[int, UnitRegistry]()
+
+# Identifies this process and those forked from it, in which ids of registries remain valid
+PROCESS_TOKEN = os.urandom(8).hex()
+
+# Fingerprints of registries which other processes can load from the cache directory
+snapshot_fingerprints = set[str]()
+
+
+class SnapshotPickler(pickle.Pickler):
+  def __init__(self, file: IO[bytes], registry: UnitRegistry, /):
+    super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+    self.registry = registry
+
+  def persistent_id(self, obj: Any, /):
+    return 'registry' if obj is self.registry else None
+
+class SnapshotUnpickler(pickle.Unpickler):
+  def __init__(self, file: IO[bytes], registry: UnitRegistry, /):
+    super().__init__(file)
+    self.registry = registry
+
+  def persistent_load(self, pid: Any, /):
+    if pid != 'registry':
+      raise pickle.UnpicklingError(f"Invalid persistent id: {pid!r}")
+
+    return self.registry
+
+
+# Snapshots are only written when a cache directory is configured
+def get_cache_dir() -> Optional[Path]:
+  path = os.environ.get('QUANTOPS_CACHE_DIR')
+  return Path(path) if path else None
+
+# Stands in for the package version, which is slow to obtain through importlib.metadata, and also
+# covers modified source trees
+@functools.cache
+def get_package_fingerprint():
+  package_path = Path(__file__).parent
+  digest = hashlib.sha256()
+
+  for name in ("core.py", "loader.py", "numeric.py", "prefixes.py", "util.py"):
+    digest.update((package_path / name).read_bytes())
+
+  return digest.hexdigest()
+
+def get_registry_fingerprint(contents: bytes, /, *, numeric: NumericBackendName = 'decimal'):
+  digest = hashlib.sha256(f"{numeric}:".encode())
+  digest.update(contents)
+
+  return digest.hexdigest()
+
+def get_snapshot_key(fingerprint: str, /, *, lazy_prefixes: bool = False):
+  return hashlib.sha256(f"{SNAPSHOT_VERSION}:{get_package_fingerprint()}:{sys.version_info[0]}.{sys.version_info[1]}:{int(lazy_prefixes)}:{fingerprint}".encode()).hexdigest()
+
+def get_snapshot_path(fingerprint: str, /, *, lazy_prefixes: bool = False):
+  cache_dir = get_cache_dir()
+  return (cache_dir / f"registry-{get_snapshot_key(fingerprint, lazy_prefixes=lazy_prefixes)}.pickle") if cache_dir else None
+
+
+def dump_snapshot(registry: UnitRegistry, file: IO[bytes], /):
+  state = { key: value for key, value in registry.__dict__.items() if key != '_caches' }
+  SnapshotPickler(file, registry).dump((SNAPSHOT_VERSION, state))
+
+def load_snapshot(cls: type[UnitRegistry], file: IO[bytes], /):
+  registry = cls.__new__(cls)
+  version, state = SnapshotUnpickler(file, registry).load()
+
+  if version != SNAPSHOT_VERSION:
+    raise pickle.UnpicklingError("Invalid snapshot version")
+
+  registry.__dict__.update(state)
+  return registry
+
+
+def write_snapshot(registry: UnitRegistry, path: Path, /):
+  import tempfile
+
+  path.parent.mkdir(parents=True, exist_ok=True)
+
+  # Written to a temporary file first so that concurrent processes never read a partial snapshot
+  with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".registry-", delete=False) as file:
+    try:
+      dump_snapshot(registry, file)
+    except BaseException:
+      file.close()
+      os.unlink(file.name)
+      raise
+
+  os.replace(file.name, path)
+
+def register_registry(registry: UnitRegistry, fingerprint: str, /):
+  registry._fingerprint = fingerprint
+  registries_by_fingerprint[fingerprint] = registry
+  registries_by_id[id(registry)] = registry
+
+def load_registry(cls: type[UnitRegistry], file: IO[bytes], /, *, cache: bool = True, lazy_prefixes: bool = False, numeric: NumericBackendName = 'decimal'):
+  contents = file.read()
+  fingerprint = get_registry_fingerprint(contents, numeric=numeric)
+  path = get_snapshot_path(fingerprint, lazy_prefixes=lazy_prefixes) if cache else None
+
+  if path:
+    try:
+      with path.open("rb") as snapshot_file:
+        registry = load_snapshot(cls, snapshot_file)
+    except (EOFError, OSError, pickle.UnpicklingError):
+      # Missing, unreadable or corrupted snapshots are rebuilt below
+      pass
+    else:
+      register_registry(registry, fingerprint)
+      snapshot_fingerprints.add(fingerprint)
+      return registry
+
+  from .loader import load
+  registry = load(cls, io.BytesIO(contents), lazy_prefixes=lazy_prefixes, numeric=numeric)
+  register_registry(registry, fingerprint)
+
+  if path:
+    try:
+      write_snapshot(registry, path)
+    except OSError:
+      pass
+    else:
+      snapshot_fingerprints.add(fingerprint)
+
+  return registry
+
+@functools.cache
+def get_default_fingerprint():
+  from importlib.resources import files
+  return get_registry_fingerprint(files("quantops").joinpath("registry.toml").read_bytes())
+
+# Returns the arguments of resolve_registry() with which the registry can be unpickled, or None if
+# other processes have no way to load it
+def get_registry_reference(registry: UnitRegistry, /):
+  fingerprint = registry._fingerprint
+
+  if (fingerprint is None) or not ((fingerprint in snapshot_fingerprints) or (fingerprint == get_default_fingerprint())):
+    return None
+
+  return fingerprint, PROCESS_TOKEN, id(registry)
+
+def resolve_registry(fingerprint: str, process_token: Optional[str] = None, registry_id: Optional[int] = None, /):
+  # Looks for the registry itself when unpickled in the process which pickled it, as several registries
+  # may share a fingerprint, then for a registry with the given fingerprint among those of this process,
+  # the bundled registry, and finally the snapshots in the cache directory
+  if (process_token == PROCESS_TOKEN) and (registry_id is not None):
+    if ((registry := registries_by_id.get(registry_id)) is not None) and (registry._fingerprint == fingerprint):
+      return registry
+
+  if (registry := registries_by_fingerprint.get(fingerprint)) is not None:
+    return registry
+
+  if fingerprint == get_default_fingerprint():
+    if (default := UnitRegistry.get_default())._fingerprint == fingerprint:
+      return default
+
+    # The default registry was replaced, for instance by one with another numeric backend
+    return UnitRegistry.load_default()
+
+  for lazy_prefixes in (False, True):
+    if (path := get_snapshot_path(fingerprint, lazy_prefixes=lazy_prefixes)):
+      try:
+        with path.open("rb") as snapshot_file:
+          registry = load_snapshot(UnitRegistry, snapshot_file)
+      except (EOFError, OSError, pickle.UnpicklingError):
+        continue
+
+      register_registry(registry, fingerprint)
+      snapshot_fingerprints.add(fingerprint)
+      return registry
+
+  raise pickle.UnpicklingError(f"Unknown registry fingerprint: {fingerprint}")
+
+
+def main():
+  import argparse
+
+  from .loader import load
+
+  parser = argparse.ArgumentParser(prog="python -m quantops.snapshot", description="Prebuild registry snapshots in the cache directory")
+  parser.add_argument('files', nargs='*', type=Path, help="registry files to compile, defaults to the bundled registry")
+  args = parser.parse_args()
+
+  if get_cache_dir() is None:
+    parser.error("Snapshots are disabled as QUANTOPS_CACHE_DIR is not set")
+
+  if args.files:
+    sources = [file_path.read_bytes() for file_path in args.files]
+  else:
+    from importlib.resources import files
+    sources = [files("quantops").joinpath("registry.toml").read_bytes()]
+
+  for contents in sources:
+    fingerprint = get_registry_fingerprint(contents)
+    path = get_snapshot_path(fingerprint)
+    assert path is not None
+
+    registry = load(UnitRegistry, io.BytesIO(contents))
+    registry._fingerprint = fingerprint
+
+    write_snapshot(registry, path)
+
+    print(path)
+
+
+if __name__ == "__main__":
+  main()
+
+
+__all__ = [
+  'SNAPSHOT_VERSION',
+  'dump_snapshot',
+  'get_cache_dir',
+  'get_registry_fingerprint',
+  'load_registry',
+  'load_snapshot',
+  'resolve_registry'
+]
@@ -1,8 +1,14 @@
-from typing import Generic, TypeVar
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Generic, NamedTuple, TypeVar
 
 
 K = TypeVar('K')
 V = TypeVar('V')
+T = TypeVar('T')
 
 class FrozenDict(dict[K, V], Generic[K, V]):
   def __hash__(self): # type: ignore
@@ -10,3 +16,93 @@ class FrozenDict(dict[K, V], Generic[K, V]):
 
   def __repr__(self):
     return f"{self.__class__.__name__}({super().__repr__()})"
+
+
+def is_array(value: object, /):
+  numpy = sys.modules.get('numpy')
+  return (numpy is not None) and isinstance(value, numpy.ndarray)
+
+
+class CacheInfo(NamedTuple):
+  hits: int
+  misses: int
+  evictions: int
+  maxsize: int
+  currsize: int
+
+class LRUCache(Generic[K, V]):
+  def __init__(self, maxsize: int = 1024):
+    self._data = OrderedDict[K, V]()
+    self._lock = threading.Lock()
+
+    lru_caches.add(self)
+
+    self.evictions = 0
+    self.hits = 0
+    self.maxsize = maxsize
+    self.misses = 0
+
+  def clear(self):
+    with self._lock:
+      self._data.clear()
+
+  def get(self, key: K, default: T = None, /) -> V | T:
+    with self._lock:
+      if key in self._data:
+        self._data.move_to_end(key)
+        self.hits += 1
+        return self._data[key]
+
+      self.misses += 1
+      return default
+
+  def info(self):
+    return CacheInfo(
+      hits=self.hits,
+      misses=self.misses,
+      evictions=self.evictions,
+      maxsize=self.maxsize,
+      currsize=len(self._data)
+    )
+
+  def put(self, key: K, value: V, /):
+    with self._lock:
+      if self.maxsize < 1:
+        return
+
+      self._data[key] = value
+      self._data.move_to_end(key)
+
+      while len(self._data) > self.maxsize:
+        self._data.popitem(last=False)
+        self.evictions += 1
+
+  def remove_if(self, predicate: Callable[[K], bool], /):
+    with self._lock:
+      for key in [key for key in self._data if predicate(key)]:
+        del self._data[key]
+
+  def resize(self, maxsize: int, /):
+    with self._lock:
+      self.maxsize = maxsize
+
+      while len(self._data) > max(maxsize, 0):
+        self._data.popitem(last=False)
+        self.evictions += 1
+
+  def __getstate__(self):
+    return { 'maxsize': self.maxsize }
+
+  def __setstate__(self, state: dict[str, Any]):
+    self.__init__(state['maxsize'])
+
+
+# Locks held by other threads at the time of a fork would never be released in the child process
+lru_caches = weakref.WeakSet['LRUCache']()
+
+def reset_lru_cache_locks():
+  for cache in list(lru_caches):
+    cache._lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+  os.register_at_fork(after_in_child=reset_lru_cache_locks)